@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Misura il tempo di rerun risparmiato dalla cache dei DataFrame.
+
+Uso:  python benchmarks/bench_data_cache.py [--reruns 30]
+
+Esegue l'app in modalità headless (``AppTest``) navigando tra le sezioni e
+confronta i rerun con cache calda con quelli in cui la cache viene svuotata
+prima di ogni rerun (cioè il comportamento precedente, dati ricostruiti ogni volta).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import inwit_data  # noqa: E402
+
+APP = os.path.join(ROOT, "inwit-dividend-app.py")
+
+
+def _navigate(reruns, clear_cache):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    options = at.selectbox(key="section").options
+    samples = []
+    for i in range(reruns):
+        if clear_cache:
+            inwit_data.clear_data_cache()
+        at.selectbox(key="section").select(options[i % len(options)])
+        start = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=30)
+    args = parser.parse_args()
+
+    cold = _navigate(args.reruns, clear_cache=True)
+    warm = _navigate(args.reruns, clear_cache=False)
+    cold_ms, warm_ms = statistics.median(cold), statistics.median(warm)
+    saved_ms = cold_ms - warm_ms
+
+    print(f"Rerun mediano senza cache dati: {cold_ms:8.2f} ms")
+    print(f"Rerun mediano con cache dati:   {warm_ms:8.2f} ms")
+    print(f"Risparmio per navigazione:      {saved_ms:8.2f} ms ({saved_ms / cold_ms:.1%} del rerun)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""Carico di sessioni concorrenti su un server Streamlit locale.
+
+Uso:  python benchmarks/bench_load.py [--app PERCORSO] [--sessions 1,10,25] [--rounds 2]
+                                      [--think 0.5] [--ramp 2] [--seed 0] [--json FILE]
+
+Per ogni livello di ``--sessions`` si avvia un server nuovo (``streamlit
+run`` in modalità headless, in ascolto solo su ``127.0.0.1`` e su una porta
+libera, senza file watcher né statistiche d'uso) e lo si pilota come farebbe
+il browser, tramite il websocket ``/_stcore/stream``: ogni sessione simulata
+invia la richiesta di rerun con lo stato dei widget e attende il messaggio
+``script_finished``. Nessuna connessione esce dalla macchina.
+
+1. Una sessione di riscaldamento visita tutte le sezioni (import lazy e
+   cache di processo caricati) e si chiude: la RSS del server a questo punto
+   è la base del livello.
+2. Le N sessioni si aprono entro ``--ramp`` secondi e percorrono ``--rounds``
+   volte tutte le voci del selettore di sezione, ciascuna partendo da una
+   sezione diversa, con una pausa casuale tra 0 e 2 x ``--think`` secondi
+   tra un cambio di sezione e il successivo.
+
+Per ogni livello si riportano:
+
+- latenza dei rerun di navigazione (invio della richiesta -> ``script_finished``):
+  p50/p95/p99 e massimo, complessivi e per sezione;
+- ``throughput``: rerun di navigazione completati al secondo;
+- ``rss_*``: memoria residente del server (base, picco campionato ogni 100 ms,
+  a fine carico con tutte le sessioni ancora aperte) e crescita per sessione
+  (fine carico - base) / N;
+- ``kib_per_rerun``: byte ricevuti dal client per rerun;
+- ``errors``: rerun terminati con eccezioni nella pagina o stato anomalo.
+
+Con pause brevi il carico è più vicino al caso peggiore (tutti i visitatori
+che cambiano sezione insieme); ``--think 0`` misura la capacità massima.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APP = os.path.join(ROOT, "inwit-dividend-app.py")
+
+SECTION_KEY = "section"
+STARTUP_TIMEOUT = 60
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_kib(pid):
+    """Memoria residente di un processo (KiB): ``/proc`` su Linux, ``ps`` altrove."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except FileNotFoundError:
+        pass
+    output = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True).stdout
+    return int(output.strip() or 0)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    position = (len(ordered) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _latency_summary(values):
+    return {
+        "count": len(values),
+        "p50_ms": _percentile(values, 0.50),
+        "p95_ms": _percentile(values, 0.95),
+        "p99_ms": _percentile(values, 0.99),
+        "max_ms": max(values, default=float("nan")),
+    }
+
+
+class Server:
+    """``streamlit run`` su una porta libera di 127.0.0.1, fermato all'uscita dal ``with``."""
+
+    def __init__(self, app_path):
+        self.app_path = os.path.abspath(app_path)
+        self.port = _free_port()
+        self.process = None
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def __enter__(self):
+        command = [
+            sys.executable, "-m", "streamlit", "run", self.app_path,
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(self.port),
+            "--server.fileWatcherType", "none",
+            "--server.runOnSave", "false",
+            "--browser.gatherUsageStats", "false",
+        ]
+        # Dalla cartella dell'app, per leggere la sua .streamlit/config.toml
+        self.process = subprocess.Popen(command, cwd=os.path.dirname(self.app_path),
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        self._wait_healthy()
+        return self
+
+    def _wait_healthy(self):
+        from urllib.error import URLError
+        from urllib.request import urlopen
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"il server è terminato all'avvio:\n{self.process.stderr.read().decode()}")
+            try:
+                with urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except (URLError, ConnectionError, TimeoutError):
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"il server non risponde dopo {STARTUP_TIMEOUT} s")
+
+    def rss_kib(self):
+        return _rss_kib(self.process.pid)
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class Session:
+    """Sessione simulata: invia i rerun come il browser e ne misura la durata."""
+
+    def __init__(self, url):
+        self.url = url
+        self.connection = None
+        self.page_script_hash = ""
+        self.section_id = None
+        self.sections = []
+        self.exception_hashes = set()  # messaggi in cache (ref_hash) che contengono eccezioni
+
+    async def connect(self):
+        from tornado.httpclient import HTTPRequest
+        from tornado.websocket import websocket_connect
+
+        request = HTTPRequest(self.url, headers={"Sec-WebSocket-Protocol": "streamlit"})
+        self.connection = await websocket_connect(request, max_message_size=64 * 1024 * 1024)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    async def rerun(self, section=None):
+        """Un rerun (con ``section`` selezionata): ``(ms, byte ricevuti, ok)``."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = self.page_script_hash
+        if section is not None:
+            widget = message.rerun_script.widget_states.widgets.add()
+            widget.id = self.section_id
+            widget.int_value = self.sections.index(section)
+
+        received, ok = 0, True
+        start = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+        while True:
+            payload = await self.connection.read_message()
+            if payload is None:
+                raise ConnectionError("connessione chiusa dal server")
+            received += len(payload)
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.page_script_hash = msg.new_session.page_script_hash
+            elif kind == "delta":
+                ok &= self._inspect(msg)
+            elif kind == "ref_hash":
+                ok &= msg.ref_hash not in self.exception_hashes
+            elif kind == "script_finished":
+                ok &= msg.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY
+                return (time.perf_counter() - start) * 1000, received, ok
+
+    def _inspect(self, msg):
+        """Registra il selettore di sezione; ``False`` se l'elemento è un'eccezione."""
+        if not msg.delta.HasField("new_element"):
+            return True
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "selectbox" and element.selectbox.id.endswith(f"-{SECTION_KEY}"):
+            self.section_id = element.selectbox.id
+            self.sections = list(element.selectbox.options)
+        if kind == "exception":
+            if msg.hash:
+                self.exception_hashes.add(msg.hash)
+            return False
+        return True
+
+
+async def _warm_up(url):
+    session = Session(url)
+    await session.connect()
+    try:
+        await session.rerun()
+        for section in session.sections:
+            await session.rerun(section)
+        return session.sections
+    finally:
+        session.close()
+
+
+async def _run_session(index, url, rounds, think, ramp, rng, samples, finished, release):
+    await asyncio.sleep(ramp * rng.random())
+    session = Session(url)
+    await session.connect()
+    try:
+        _, _, ok = await session.rerun()
+        samples["errors"] += not ok
+        sections = session.sections
+        start = index % len(sections)
+        route = sections[start:] + sections[:start]
+        for _ in range(rounds):
+            for section in route:
+                if think:
+                    await asyncio.sleep(rng.uniform(0, 2 * think))
+                ms, received, ok = await session.rerun(section)
+                samples["latency"].setdefault(section, []).append(ms)
+                samples["bytes"] += received
+                samples["errors"] += not ok
+    finally:
+        finished()
+        # Resta aperta finché non è stata misurata la memoria con tutte le sessioni attive
+        await release.wait()
+        session.close()
+
+
+async def _sample_rss(server, peak, stop):
+    while not stop.is_set():
+        peak[0] = max(peak[0], server.rss_kib())
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _load(server, sessions, rounds, think, ramp, seed):
+    sections = await _warm_up(server.url)
+    await asyncio.sleep(1.0)
+    rss_base = server.rss_kib()
+
+    samples = {"latency": {}, "bytes": 0, "errors": 0}
+    pending = [sessions]
+    all_finished, release, stop = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+    def finished():
+        pending[0] -= 1
+        if not pending[0]:
+            all_finished.set()
+
+    peak = [rss_base]
+    sampler = asyncio.ensure_future(_sample_rss(server, peak, stop))
+    start = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(_run_session(i, server.url, rounds, think, ramp, random.Random(seed + i),
+                                           samples, finished, release))
+        for i in range(sessions)
+    ]
+    await all_finished.wait()
+    elapsed = time.perf_counter() - start
+    rss_loaded = server.rss_kib()
+    release.set()
+    stop.set()
+    await asyncio.gather(*tasks, sampler)
+
+    latencies = [ms for values in samples["latency"].values() for ms in values]
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput": len(latencies) / elapsed,
+        **_latency_summary(latencies),
+        "rss_base_mib": rss_base / 1024,
+        "rss_peak_mib": peak[0] / 1024,
+        "rss_loaded_mib": rss_loaded / 1024,
+        "rss_per_session_mib": (rss_loaded - rss_base) / 1024 / sessions,
+        "kib_per_rerun": samples["bytes"] / 1024 / max(len(latencies), 1),
+        "errors": samples["errors"],
+        "sections": {section: _latency_summary(samples["latency"].get(section, [])) for section in sections},
+    }
+
+
+def _print_level(result):
+    print(f"{result['sessions']:>8d} {result['reruns']:>7d} {result['throughput']:>9.1f} "
+          f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['max_ms']:>8.1f} "
+          f"{result['rss_base_mib']:>8.1f} {result['rss_peak_mib']:>8.1f} {result['rss_per_session_mib']:>10.2f} "
+          f"{result['kib_per_rerun']:>8.1f} {result['errors']:>6d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--sessions", default="1,10,25",
+                        help="sessioni concorrenti, uno o più livelli separati da virgola")
+    parser.add_argument("--rounds", type=int, default=2, help="giri completi delle sezioni per sessione")
+    parser.add_argument("--think", type=float, default=0.5, help="pausa media tra due cambi di sezione (s)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="intervallo di apertura delle sessioni (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="scrive i risultati in questo file")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.sessions.split(",")]
+
+    results = []
+    print(f"{'sessioni':>8s} {'rerun':>7s} {'rerun/s':>9s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} "
+          f"{'max ms':>8s} {'RSS MiB':>8s} {'picco':>8s} {'MiB/sess.':>10s} {'KiB/run':>8s} {'errori':>6s}")
+    for sessions in levels:
+        with Server(args.app) as server:
+            result = asyncio.run(_load(server, sessions, args.rounds, args.think, args.ramp, args.seed))
+        results.append(result)
+        _print_level(result)
+
+    worst = results[-1]
+    print(f"\nLatenza per sezione con {worst['sessions']} sessioni:")
+    print(f"{'Sezione':32s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for section, summary in worst["sections"].items():
+        print(f"{section:32s} {summary['p50_ms']:8.1f} {summary['p95_ms']:8.1f} {summary['p99_ms']:8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"app": os.path.abspath(args.app), "rounds": args.rounds, "think_s": args.think,
+                       "ramp_s": args.ramp, "levels": results}, file, indent=2, ensure_ascii=False)
+    if any(result["errors"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Memoria per sessione: dati condivisi dal processo e overhead di ogni sessione.
+
+Uso:  python benchmarks/bench_memory.py [--app PERCORSO] [--sessions 5] [--json FILE] [--baseline FILE]
+
+L'app gira in modalità headless (``AppTest``) in un interprete nuovo
+(``--worker``), con ``tracemalloc`` attivo. Una prima sessione visita tutte
+le sezioni e carica le cache di processo; poi ``--sessions`` sessioni,
+tenute tutte aperte, visitano a loro volta tutte le sezioni. Si misura:
+
+- ``shared_kib``: memoria dei DataFrame del titolo nella cache di processo,
+  tenuti una sola volta e condivisi da tutte le sessioni;
+- ``rerun_peak_kib``: per sezione, la memoria allocata in più durante un
+  rerun (picco meno memoria all'inizio, mediana delle sessioni): è il costo
+  di ogni sessione che esegue un rerun in contemporanea alle altre;
+- ``retained_kib_per_session``: memoria che resta allocata per ogni sessione
+  aperta dopo le visite. Comprende la copia della pagina tenuta dal client di
+  test, quindi va letta come confronto tra due versioni più che in assoluto.
+
+Con ``--baseline`` si stampa il confronto con un file salvato in precedenza
+(es. misurato con ``--app`` su una versione estratta con ``git worktree``).
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APP = os.path.join(ROOT, "inwit-dividend-app.py")
+
+
+def _visit_all(at, peaks=None):
+    for option in at.selectbox(key="section").options:
+        at.selectbox(key="section").select(option)
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        if peaks is not None:
+            peaks.setdefault(option, []).append(tracemalloc.get_traced_memory()[1] - start)
+
+
+def _shared_bytes(ticker):
+    from inwit_data import load_frames
+
+    return sum(int(df.memory_usage(index=True, deep=True).sum()) for df in load_frames(ticker).values())
+
+
+def _worker(app_path, sessions):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    from streamlit.testing.v1 import AppTest
+
+    tracemalloc.start()
+    warm = AppTest.from_file(app_path, default_timeout=120).run()
+    _visit_all(warm)
+    ticker = warm.session_state["ticker"]
+    del warm
+    gc.collect()
+    base = tracemalloc.get_traced_memory()[0]
+
+    open_sessions, peaks = [], {}
+    for _ in range(sessions):
+        at = AppTest.from_file(app_path, default_timeout=120).run()
+        _visit_all(at, peaks)
+        open_sessions.append(at)
+    gc.collect()
+    retained = (tracemalloc.get_traced_memory()[0] - base) / sessions
+
+    from inwit_registry import ticker_labels
+    print(json.dumps({
+        "shared_kib": _shared_bytes(ticker_labels()[ticker]) / 1024,
+        "retained_kib_per_session": retained / 1024,
+        "rerun_peak_kib": {option: statistics.median(values) / 1024 for option, values in peaks.items()},
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--json", help="scrive i risultati in questo file")
+    parser.add_argument("--baseline", help="file JSON di una misura precedente da confrontare")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.app, args.sessions)
+        return
+
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", "--app", args.app, "--sessions", str(args.sessions)],
+        check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(args.app)),
+    ).stdout
+    result = {"app": os.path.abspath(args.app), "sessions": args.sessions,
+              **json.loads(output.strip().splitlines()[-1])}
+    result["rerun_peak_median_kib"] = statistics.median(result["rerun_peak_kib"].values())
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    lines = [("Dati condivisi (una volta)", "shared_kib", None)]
+    lines += [(option, "rerun_peak_kib", option) for option in result["rerun_peak_kib"]]
+    lines += [("Picco rerun (mediana)", "rerun_peak_median_kib", None),
+              ("Trattenuta per sessione", "retained_kib_per_session", None)]
+    print(f"{'KiB':32s} {'baseline' if baseline else '':>10s} {'attuale':>10s}")
+    for label, key, option in lines:
+        now = result[key] if option is None else result[key][option]
+        before = ""
+        if baseline:
+            value = baseline[key] if option is None else baseline[key].get(option)
+            before = "" if value is None else f"{value:10.1f}"
+        print(f"{label:32s} {before:>10s} {now:10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
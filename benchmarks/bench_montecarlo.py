@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Misura il tempo della simulazione Monte Carlo della copertura FCF.
+
+Uso:  python benchmarks/bench_montecarlo.py [--ticker INWIT.MI] [--repeat 5] [--budget-ms 1000]
+
+Esegue la simulazione senza cache (``simulate_coverage``) per numeri di
+percorsi crescenti e riporta il tempo mediano; esce con errore se la
+simulazione con il numero di percorsi di default supera il budget.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from inwit_data import load_frame  # noqa: E402
+from inwit_montecarlo import DEFAULT_PATHS, calibrate, simulate_coverage  # noqa: E402
+from inwit_registry import company_info, default_ticker  # noqa: E402
+
+PATHS = [DEFAULT_PATHS, 250_000, 500_000, 1_000_000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticker", default=default_ticker())
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    df = load_frame(args.ticker, "fcf_analysis")
+    params = calibrate(df, company_info(args.ticker))
+
+    timings = {}
+    for paths in PATHS:
+        samples = []
+        for seed in range(args.repeat):
+            start = time.perf_counter()
+            simulation = simulate_coverage(params, paths, seed)
+            simulation.prob_below(1.0)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[paths] = statistics.median(samples)
+        print(f"{paths:>9,} percorsi x {params.years} anni: {timings[paths]:8.1f} ms  "
+              f"P(copertura < 1.0x) {simulation.prob_below(1.0)[-1]:.1%}")
+
+    if timings[DEFAULT_PATHS] > args.budget_ms:
+        print(f"Budget superato: {timings[DEFAULT_PATHS]:.1f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
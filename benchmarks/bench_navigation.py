@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Latenza di avvio a freddo e di navigazione tra le sezioni.
+
+Uso:  python benchmarks/bench_navigation.py [--app PERCORSO] [--runs 5] [--json FILE]
+
+Ogni misura gira in un interprete nuovo (``--worker``), così l'avvio a freddo
+include davvero import e costruzione dei moduli. Per ogni sezione si misura
+la prima visita (eventuali import lazy inclusi) e le visite successive.
+Con ``--app`` si può misurare un'altra copia dell'app (es. una versione
+precedente estratta con ``git worktree``) per confrontare prima e dopo.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APP = os.path.join(ROOT, "inwit-dividend-app.py")
+
+
+def _worker(app_path):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    at = AppTest.from_file(app_path, default_timeout=60).run()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    first, repeat = {}, {}
+    options = at.selectbox(key="section").options
+    for visit in (first, repeat):
+        for option in options:
+            at.selectbox(key="section").select(option)
+            start = time.perf_counter()
+            at.run()
+            visit[option] = (time.perf_counter() - start) * 1000
+    print(json.dumps({"cold_start_ms": cold_ms, "first_visit_ms": first, "repeat_visit_ms": repeat}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="scrive i risultati aggregati in questo file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.app)
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--app", args.app],
+            check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(args.app)),
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    result = {
+        "app": os.path.abspath(args.app),
+        "runs": args.runs,
+        "cold_start_ms": statistics.median(r["cold_start_ms"] for r in runs),
+        "first_visit_ms": {k: statistics.median(r["first_visit_ms"][k] for r in runs) for k in runs[0]["first_visit_ms"]},
+        "repeat_visit_ms": {k: statistics.median(r["repeat_visit_ms"][k] for r in runs) for k in runs[0]["repeat_visit_ms"]},
+    }
+
+    print(f"Avvio a freddo (primo rerun): {result['cold_start_ms']:8.1f} ms")
+    print(f"{'Sezione':32s} {'1a visita':>10s} {'visite succ.':>12s}")
+    for option, ms in result["first_visit_ms"].items():
+        print(f"{option:32s} {ms:8.1f} ms {result['repeat_visit_ms'][option]:9.1f} ms")
+    print(f"{'Mediana navigazione':32s} {statistics.median(result['first_visit_ms'].values()):8.1f} ms "
+          f"{statistics.median(result['repeat_visit_ms'].values()):9.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
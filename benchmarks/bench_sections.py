@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Costo di rendering di ciascuna sezione: tempo, memoria ed elementi inviati.
+
+Uso:  python benchmarks/bench_sections.py [--app PERCORSO] [--runs 3] [--reruns 5]
+                                          [--json FILE] [--baseline FILE] [--tolerance 0.25]
+
+L'app gira in modalità headless (``AppTest``), in un interprete nuovo per
+ogni run (``--worker``). Per ogni valore del selettore di sezione si misura:
+
+- ``first_visit_ms``: rerun della prima visita (import lazy e cache fredde);
+- ``rerun_ms``: mediana dei rerun successivi sulla stessa sezione;
+- ``peak_kib``: picco di memoria Python allocata durante un rerun (``tracemalloc``,
+  misurato a parte per non falsare i tempi);
+- ``elements`` / ``bytes``: numero e dimensione serializzata dei messaggi
+  ``delta`` inviati al browser nel rerun (header e sidebar compresi);
+- ``chart_bytes``: la parte di ``bytes`` dovuta ai grafici Plotly;
+- ``wire_bytes``: i byte effettivamente inviati nel rerun considerando la
+  cache dei messaggi di Streamlit: un elemento grande almeno
+  ``global.minCachedMessageSize`` (``.streamlit/config.toml``) già inviato
+  nella sessione viaggia come riferimento al suo hash.
+
+I risultati (mediana dei run) vanno in un file JSON. Con ``--baseline`` si
+confrontano con un file salvato in precedenza: il processo termina con
+codice 1 se una metrica di una sezione peggiora oltre ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APP = os.path.join(ROOT, "inwit-dividend-app.py")
+DEFAULT_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sections_result.json")
+
+METRICS = ["first_visit_ms", "rerun_ms", "peak_kib", "elements", "bytes", "chart_bytes", "wire_bytes"]
+
+# Metriche deterministiche: confrontate con la baseline senza margine di rumore
+EXACT_METRICS = {"elements", "bytes", "chart_bytes", "wire_bytes"}
+
+
+def _worker(app_path, reruns, ticker):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    from streamlit import config
+    from streamlit.runtime.forward_msg_cache import create_reference_msg, populate_hash_if_needed
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.testing.v1 import AppTest
+
+    sent = {"elements": 0, "bytes": 0, "chart_bytes": 0, "wire_bytes": 0}
+    session_hashes = set()  # messaggi già presenti nella cache del browser
+    enqueue = ForwardMsgQueue.enqueue
+
+    def counting_enqueue(self, msg):
+        if msg.HasField("delta"):
+            size = msg.ByteSize()
+            sent["elements"] += 1
+            sent["bytes"] += size
+            if msg.delta.HasField("new_element") and msg.delta.new_element.WhichOneof("type") == "plotly_chart":
+                sent["chart_bytes"] += size
+            wire = size
+            if size >= config.get_option("global.minCachedMessageSize"):
+                digest = populate_hash_if_needed(msg)
+                if digest in session_hashes:
+                    wire = create_reference_msg(msg).ByteSize()
+                session_hashes.add(digest)
+            sent["wire_bytes"] += wire
+        enqueue(self, msg)
+
+    ForwardMsgQueue.enqueue = counting_enqueue
+
+    def rerun(at):
+        sent.update(elements=0, bytes=0, chart_bytes=0, wire_bytes=0)
+        start = time.perf_counter()
+        at.run()
+        elapsed = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return elapsed
+
+    at = AppTest.from_file(app_path, default_timeout=60).run()
+    if ticker:
+        label = next(o for o in at.selectbox(key="ticker").options if ticker in o)
+        at.selectbox(key="ticker").select(label).run()
+
+    result = {}
+    for option in at.selectbox(key="section").options:
+        at.selectbox(key="section").select(option)
+        first_ms = rerun(at)
+        samples = [rerun(at) for _ in range(reruns)]
+        counts = dict(sent)
+
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        at.run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        result[option] = {
+            "first_visit_ms": first_ms,
+            "rerun_ms": statistics.median(samples),
+            "peak_kib": peak / 1024,
+            **counts,
+        }
+    print(json.dumps(result, ensure_ascii=False))
+
+
+def _compare(result, baseline, tolerance):
+    regressions = []
+    for section, metrics in result["sections"].items():
+        before = baseline.get("sections", {}).get(section)
+        if before is None:
+            continue
+        for metric in METRICS:
+            if metric not in before:
+                continue
+            limit = before[metric] * (1 if metric in EXACT_METRICS else 1 + tolerance)
+            if metrics[metric] > limit:
+                regressions.append(f"{section} {metric}: {before[metric]:.1f} -> {metrics[metric]:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--ticker", help="titolo da selezionare (default: quello del registro)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--json", default=DEFAULT_JSON, help="file JSON dei risultati")
+    parser.add_argument("--baseline", help="file JSON di un run precedente da confrontare")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="peggioramento relativo ammesso per tempi e memoria")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.app, args.reruns, args.ticker)
+        return
+
+    command = [sys.executable, os.path.abspath(__file__), "--worker", "--app", args.app,
+               "--reruns", str(args.reruns)]
+    if args.ticker:
+        command += ["--ticker", args.ticker]
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            command, check=True, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(args.app)),
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    result = {
+        "app": os.path.abspath(args.app),
+        "ticker": args.ticker,
+        "runs": args.runs,
+        "reruns": args.reruns,
+        "sections": {
+            section: {m: statistics.median(r[section][m] for r in runs) for m in METRICS}
+            for section in runs[0]
+        },
+    }
+
+    print(f"{'Sezione':32s} {'1a visita':>10s} {'rerun':>10s} {'picco mem':>11s} {'elementi':>9s} {'byte':>9s} "
+          f"{'grafici':>9s} {'inviati':>9s}")
+    for section, m in result["sections"].items():
+        print(f"{section:32s} {m['first_visit_ms']:7.1f} ms {m['rerun_ms']:7.1f} ms "
+              f"{m['peak_kib']:7.0f} KiB {m['elements']:9.0f} {m['bytes']:9.0f} {m['chart_bytes']:9.0f} "
+              f"{m['wire_bytes']:9.0f}")
+
+    with open(args.json, "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = _compare(result, json.load(file), args.tolerance)
+        for line in regressions:
+            print(f"Regressione: {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Benchmark di avvio: tempo di import e time-to-first-paint, con budget.
+
+Uso:  python benchmarks/bench_startup.py [--runs 7] [--budget FILE] [--app PERCORSO]
+
+Ogni misura gira in un interprete nuovo:
+
+- ``import_ms``: import di Streamlit e dei moduli importati a livello top
+  dallo script dell'app (letti dal suo AST);
+- ``first_paint_ms``: dall'avvio del primo rerun al primo elemento inviato
+  al browser (il titolo della pagina);
+- ``first_run_ms``: durata completa del primo rerun (sezione di default).
+
+Il processo termina con codice 1 se la mediana di una metrica supera il
+budget configurato in ``startup_budget.json``. I budget sono le mediane di
+un'esecuzione con le opzioni di default (sette misure, ``--runs 7``) e le
+versioni di ``requirements.txt``, più il 30% per il rumore della macchina,
+arrotondate per eccesso ai 10 ms: vanno ricalcolati allo stesso modo
+quando cambiano le dipendenze.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_APP = os.path.join(ROOT, "inwit-dividend-app.py")
+DEFAULT_BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+
+def _top_level_imports(app_path):
+    with open(app_path, encoding="utf-8") as file:
+        tree = ast.parse(file.read())
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return compile(ast.Module(body=nodes, type_ignores=[]), app_path, "exec")
+
+
+def _worker_imports(app_path):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    imports = _top_level_imports(app_path)
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    exec(imports, {})
+    return {"import_ms": (time.perf_counter() - start) * 1000}
+
+
+def _worker_first_paint(app_path):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.testing.v1 import AppTest
+
+    first_delta = []
+    enqueue = ForwardMsgQueue.enqueue
+
+    def timed_enqueue(self, msg):
+        if not first_delta and msg.HasField("delta"):
+            first_delta.append(time.perf_counter())
+        enqueue(self, msg)
+
+    ForwardMsgQueue.enqueue = timed_enqueue
+    at = AppTest.from_file(app_path, default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    end = time.perf_counter()
+    return {"first_paint_ms": (first_delta[0] - start) * 1000, "first_run_ms": (end - start) * 1000}
+
+
+def _measure(app_path, worker):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", worker, "--app", app_path],
+        check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(app_path)),
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=DEFAULT_APP)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget", default=DEFAULT_BUDGET)
+    parser.add_argument("--worker", choices=["imports", "first_paint"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker = _worker_imports if args.worker == "imports" else _worker_first_paint
+        print(json.dumps(worker(args.app)))
+        return
+
+    samples = {}
+    for _ in range(args.runs):
+        for worker in ("imports", "first_paint"):
+            for metric, value in _measure(args.app, worker).items():
+                samples.setdefault(metric, []).append(value)
+
+    with open(args.budget, encoding="utf-8") as file:
+        budget = json.load(file)
+
+    failed = False
+    for metric, values in samples.items():
+        median = statistics.median(values)
+        limit = budget.get(metric)
+        status = "ok" if limit is None or median <= limit else "FUORI BUDGET"
+        failed |= status != "ok"
+        limit_text = f"{limit:8.1f} ms" if limit is not None else "       -"
+        print(f"{metric:16s} {median:8.1f} ms  (budget {limit_text})  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
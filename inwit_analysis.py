@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Indice delle sezioni di ``Analisi_INWIT.md``, analizzato una sola volta.
+
+Il file viene riletto solo quando cambia il suo mtime (o la dimensione) e
+ri-analizzato solo quando cambia il suo hash: un semplice ``touch`` non
+costa un nuovo parsing. Le sezioni si cercano per numero di titolo
+(``index.get(6)``), non per posizione. La conversione in HTML e la divisione
+in pagine delle sezioni lunghe stanno in ``inwit_report_html``.
+"""
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+
+import streamlit as st
+
+ANALYSIS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Analisi_INWIT.md")
+
+# Contenuto fallback in caso il file non sia disponibile
+FALLBACK_TEXT = """
+# Analisi non disponibile
+
+Il file di analisi non è stato trovato. Assicurarsi che il file "Analisi_INWIT.md" sia nella stessa directory dell'applicazione.
+"""
+
+# Titoli numerati di primo livello: "6. Analisi delle 5 Forze di Porter".
+# Gli elenchi numerati interni alle sezioni (es. le 5 forze) sono paragrafi
+# lunghi e non seguono la numerazione progressiva, quindi non vengono scambiati per titoli.
+_HEADING_RE = re.compile(r"^(\d+)\. (.{1,80})$")
+
+
+@dataclass(frozen=True)
+class AnalysisSection:
+    number: int
+    title: str
+    text: str  # testo completo della sezione, riga del titolo inclusa
+
+    @property
+    def body(self):
+        return self.text.partition("\n")[2]
+
+
+@dataclass(frozen=True)
+class AnalysisIndex:
+    executive_summary: str
+    sections: dict  # numero del titolo -> AnalysisSection
+    digest: str
+
+    def get(self, number):
+        return self.sections.get(number)
+
+
+def parse_analysis(text, digest=""):
+    """Suddivide il report in Executive Summary e sezioni numerate 1..N."""
+    summary_lines = []
+    sections = {}
+    current = None
+    expected = 1
+    for line in text.splitlines():
+        match = _HEADING_RE.match(line.strip())
+        if match and int(match.group(1)) == expected:
+            current = (expected, match.group(2).strip(), [line])
+            sections[expected] = current
+            expected += 1
+        elif current is None:
+            summary_lines.append(line)
+        else:
+            current[2].append(line)
+
+    return AnalysisIndex(
+        executive_summary="\n".join(summary_lines),
+        sections={
+            number: AnalysisSection(number, title, "\n".join(lines))
+            for number, (_, title, lines) in sections.items()
+        },
+        digest=digest,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _parse_by_digest(digest, _text):
+    # Il testo non entra nella chiave della cache (prefisso "_"): basta l'hash.
+    return parse_analysis(_text, digest)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_by_mtime(filename, mtime_ns, size):
+    with open(filename, "rb") as file:
+        raw = file.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    return _parse_by_digest(digest, raw.decode("utf-8"))
+
+
+def load_analysis(filename=ANALYSIS_PATH):
+    """Restituisce l'``AnalysisIndex`` del report, dalla cache se il file non è cambiato."""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return parse_analysis(FALLBACK_TEXT)
+    return _load_by_mtime(filename, stat.st_mtime_ns, stat.st_size)
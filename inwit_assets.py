@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Risorse statiche condivise dalle pagine: foglio di stile e disclaimer.
+
+Il CSS (``assets/inwit.css``) e il disclaimer (``assets/disclaimer.html``)
+sono letti una volta all'import e disegnati sempre con lo stesso contenuto,
+in testa alla pagina e in fondo alle sezioni che lo riportano.
+
+Streamlit invia per intero un elemento solo la prima volta in una sessione
+se è grande almeno ``global.minCachedMessageSize`` byte: nei rerun
+successivi, e per le copie identiche nella stessa pagina, manda solo
+l'hash del contenuto (circa 50 byte) e il browser lo riprende dalla propria
+cache. ``.streamlit/config.toml`` abbassa la soglia da 10 KB a 512 byte,
+così stile e disclaimer viaggiano una volta per sessione, come i grafici e
+i testi del report che non cambiano tra un rerun e l'altro.
+
+Il foglio di stile non è servito come file statico
+(``server.enableStaticServing``): Streamlit invia i file non immagine
+come ``text/plain`` con ``nosniff`` e il browser non li applica come CSS.
+"""
+import os
+
+import streamlit as st
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+
+def _read(name):
+    with open(os.path.join(ASSETS_DIR, name), encoding="utf-8") as file:
+        return file.read()
+
+
+STYLESHEET = _read("inwit.css")
+DISCLAIMER_HTML = _read("disclaimer.html")
+
+
+def render_styles():
+    """Foglio di stile della dashboard."""
+    st.markdown(f"<style>\n{STYLESHEET}</style>", unsafe_allow_html=True)
+
+
+def render_disclaimer():
+    """Disclaimer standard (stesso elemento in ogni posizione della pagina)."""
+    st.markdown(DISCLAIMER_HTML, unsafe_allow_html=True)
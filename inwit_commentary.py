@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Commenti di analisi scritti per un singolo titolo.
+
+I riquadri descrittivi delle sezioni (insight sui dividendi, driver del
+piano, punti di forza e rischi, sintesi della valutazione...) valgono solo
+per il titolo per cui sono stati scritti: stanno nel suo bundle, in
+``data/<ticker>/commenti/``, uno per file:
+
+- ``<nome>.html``: blocco HTML, con le classi di ``assets/inwit.css``;
+- ``<nome>.md``: nota in markdown, mostrata con ``st.info``.
+
+Le sezioni chiedono i commenti per nome; per un titolo che non ne ha
+non viene mostrato nulla. I file sono letti una volta per processo (la
+chiave include l'mtime, come per le tabelle).
+"""
+import os
+
+import streamlit as st
+
+from inwit_data import DATA_DIR
+
+COMMENTARY_DIR = "commenti"
+FORMATS = ("html", "md")
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _read_cached(path, mtime_ns):
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def _find(ticker, name):
+    for extension in FORMATS:
+        path = os.path.join(DATA_DIR, ticker, COMMENTARY_DIR, f"{name}.{extension}")
+        if os.path.exists(path):
+            return path, extension
+    return None, None
+
+
+def render_commentary(company, name):
+    """Mostra il commento ``name`` del titolo, se c'è."""
+    path, extension = _find(company["ticker"], name)
+    if path is None:
+        return
+    text = _read_cached(path, os.stat(path).st_mtime_ns)
+    if extension == "html":
+        st.markdown(text, unsafe_allow_html=True)
+    else:
+        st.info(text)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""Caricamento dei DataFrame dall'archivio colonnare in ``data/``.
+
+Ogni titolo ha un bundle ``data/<ticker>/`` in formato Arrow IPC non
+compresso, letto con memory-map:
+
+- ``facts.arrow``: la fact table normalizzata (anno x metrica, vedi
+  ``inwit_facts``) da cui si ricavano le tabelle annuali (``dps``,
+  ``fin_clean``, ``projections``...), più ``annotations.arrow`` con i testi;
+- ``<nome>.arrow``: le tabelle che non sono serie annuali del titolo (peers,
+  strumenti di debito, scenari), una per file, lette proiettando solo le
+  colonne richieste dalla sezione.
+
+Le colonne derivate (variazioni, payout, coperture, vedi ``inwit_derived``)
+non sono salvate: vengono calcolate al caricamento a partire dalle colonne
+di input e, quando i dati cambiano, ricalcolate solo nelle righe toccate.
+
+I DataFrame sono serviti da ``st.cache_resource``, condivisi tra sessioni e
+rerun, separatamente per titolo; la chiave include l'mtime dei file, quindi
+aggiornare un file in ``data/`` basta a far ricaricare i dati senza riavviare
+il server.
+``st.cache_data`` non è usata perché restituisce una copia deserializzata a
+ogni chiamata, che costa quanto ricostruire i dati: chi deve modificare un
+DataFrame ne fa una copia. ``clear_data_cache()`` forza il ricaricamento.
+
+Aggiornamento dei dati da riga di comando (anche per le tabelle ricavate
+dalla fact table: l'import aggiorna i fatti corrispondenti)::
+
+    python inwit_data.py export INWIT.MI dps dps.csv   # tabella -> CSV da modificare
+    python inwit_data.py import INWIT.MI dps dps.csv   # CSV -> tabella (tipi invariati)
+"""
+import argparse
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import streamlit as st
+
+from inwit_derived import DERIVED_COLUMNS, refresh_derived
+from inwit_facts import (
+    ANNOTATION_COLUMNS, VIEWS, build_view, merge, normalize_annotations, normalize_facts, view_to_facts,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+FACTS_FILE = "facts"
+ANNOTATIONS_FILE = "annotations"
+
+# Ultima versione calcolata di ogni tabella con colonne derivate e righe
+# ricalcolate ((file, nome) -> (DataFrame, chiavi)), base del ricalcolo
+# incrementale quando i dati cambiano. Limitata come la cache delle tabelle
+# derivate: oltre DERIVED_MAX_ENTRIES si scarta la usata meno di recente.
+DERIVED_MAX_ENTRIES = 64
+_previous_versions = OrderedDict()
+_versions_lock = threading.Lock()
+
+
+def frame_path(ticker, name):
+    return os.path.join(DATA_DIR, ticker, f"{name}.arrow")
+
+
+def frame_names(ticker):
+    """Nomi delle tabelle disponibili nel bundle del titolo."""
+    bundle = os.path.join(DATA_DIR, ticker)
+    files = {f[:-len(".arrow")] for f in os.listdir(bundle) if f.endswith(".arrow")}
+    names = files - {FACTS_FILE, ANNOTATIONS_FILE}
+    if FACTS_FILE in files:
+        names |= set(VIEWS)
+    return sorted(names)
+
+
+def _source(ticker, name):
+    """File da cui si ricava la tabella ``name`` e loro mtime (parte della chiave di cache)."""
+    if name not in VIEWS:
+        path = frame_path(ticker, name)
+        return (path,), (os.stat(path).st_mtime_ns,)
+    facts, annotations = frame_path(ticker, FACTS_FILE), frame_path(ticker, ANNOTATIONS_FILE)
+    # Le annotazioni sono facoltative
+    annotations_mtime = os.stat(annotations).st_mtime_ns if os.path.exists(annotations) else 0
+    return (facts, annotations), (os.stat(facts).st_mtime_ns, annotations_mtime)
+
+
+def _read_facts(facts_path, annotations_path):
+    facts = feather.read_table(facts_path, memory_map=True).to_pandas()
+    if os.path.exists(annotations_path):
+        annotations = feather.read_table(annotations_path, memory_map=True).to_pandas()
+    else:
+        annotations = normalize_annotations(pd.DataFrame(columns=ANNOTATION_COLUMNS))
+    return facts, annotations
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _facts_cached(paths, mtimes):
+    return _read_facts(*paths)
+
+
+def _read_table(paths, mtimes, name, columns=None):
+    if name in VIEWS:
+        return build_view(*_facts_cached(paths, mtimes), name)
+    table = feather.read_table(paths[0], columns=list(columns) if columns else None, memory_map=True)
+    return table.to_pandas()
+
+
+@st.cache_resource(show_spinner=False, max_entries=DERIVED_MAX_ENTRIES)
+def _derived_table(paths, mtimes, name):
+    raw = _read_table(paths, mtimes, name)
+    key = (paths[0], name)
+    with _versions_lock:
+        previous, _ = _previous_versions.get(key, (None, None))
+        df, recomputed = refresh_derived(raw, name, previous)
+        _previous_versions[key] = (df, recomputed)
+        _previous_versions.move_to_end(key)
+        while len(_previous_versions) > DERIVED_MAX_ENTRIES:
+            _previous_versions.popitem(last=False)
+    return df
+
+
+# Il limite di voci tiene costante la memoria del processo anche con molti
+# titoli: i bundle usati meno di recente vengono scartati e ricaricati al bisogno.
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _load_frame_cached(paths, mtimes, name, columns):
+    if name in DERIVED_COLUMNS:
+        df = _derived_table(paths, mtimes, name)
+    else:
+        df = _read_table(paths, mtimes, name, columns)
+    return df if columns is None else df[list(columns)]
+
+
+def load_frame(ticker, name, columns=None):
+    """DataFrame ``name`` del titolo (solo ``columns`` se indicate, derivate incluse), dalla cache."""
+    paths, mtimes = _source(ticker, name)
+    columns = tuple(columns) if columns is not None else None
+    return _load_frame_cached(paths, mtimes, name, columns)
+
+
+def load_frames(ticker, spec=None):
+    """Dizionario ``nome -> DataFrame``; ``spec`` mappa i nomi alle colonne (``None`` = tutte)."""
+    if spec is None:
+        spec = dict.fromkeys(frame_names(ticker))
+    return {name: load_frame(ticker, name, columns) for name, columns in spec.items()}
+
+
+def load_facts(ticker):
+    """Fact table e annotazioni del titolo, dalla cache."""
+    return _facts_cached(*_source(ticker, next(iter(VIEWS))))
+
+
+def year_annotations(ticker, attribute):
+    """Annotazioni ``attribute`` per anno del titolo come tupla ``((anno, testo), ...)``, es. gli eventi dei grafici."""
+    _, annotations = load_facts(ticker)
+    rows = annotations[(annotations["scope"] == "year") & (annotations["attribute"] == attribute)]
+    return tuple(sorted((int(key), str(text)) for key, text in zip(rows["key"], rows["text"])))
+
+
+def last_refresh(ticker, name):
+    """Chiavi delle righe ricalcolate, per colonna derivata, all'ultimo caricamento della tabella."""
+    paths, _ = _source(ticker, name)
+    with _versions_lock:
+        _, recomputed = _previous_versions.get((paths[0], name), (None, {}))
+    return recomputed
+
+
+def clear_data_cache():
+    """Invalida la cache: il prossimo caricamento rilegge i file e ricalcola tutte le derivate."""
+    _load_frame_cached.clear()
+    _derived_table.clear()
+    _facts_cached.clear()
+    with _versions_lock:
+        _previous_versions.clear()
+
+
+def _write(df, path):
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), path, compression="uncompressed")
+
+
+def export_csv(ticker, name, csv_path):
+    if name in VIEWS:
+        paths, _ = _source(ticker, name)
+        build_view(*_read_facts(*paths), name).to_csv(csv_path, index=False)
+    else:
+        feather.read_table(frame_path(ticker, name)).to_pandas().to_csv(csv_path, index=False)
+
+
+def _import_view(ticker, name, csv_path):
+    paths, _ = _source(ticker, name)
+    facts, annotations = _read_facts(*paths)
+    current = build_view(facts, annotations, name)
+    new_facts, new_annotations = view_to_facts(pd.read_csv(csv_path), name, facts, ticker)
+    facts = normalize_facts(merge(facts, new_facts, ["entity", "year", "metric"]))
+    annotations = normalize_annotations(
+        merge(annotations, new_annotations, ["entity", "scope", "key", "attribute"])
+    )
+    _write(facts, paths[0])
+    _write(annotations, paths[1])
+    return current, build_view(facts, annotations, name)
+
+
+def import_csv(ticker, name, csv_path):
+    """Sostituisce la tabella ``name`` con il CSV, mantenendo lo schema esistente.
+
+    Per le tabelle ricavate dalla fact table aggiorna (o aggiunge) i fatti
+    presenti nel CSV. Restituisce le righe le cui colonne derivate
+    cambieranno, per colonna.
+    """
+    if name in VIEWS:
+        current, updated = _import_view(ticker, name, csv_path)
+    else:
+        table = feather.read_table(frame_path(ticker, name), memory_map=True)
+        schema = table.schema
+        options = pa_csv.ConvertOptions(column_types={field.name: field.type for field in schema})
+        new_table = pa_csv.read_csv(csv_path, convert_options=options).select(schema.names).cast(schema)
+        current, updated = table.to_pandas(), new_table.to_pandas()
+        feather.write_feather(new_table, frame_path(ticker, name), compression="uncompressed")
+    previous, _ = refresh_derived(current, name)
+    _, recomputed = refresh_derived(updated, name, previous)
+    return recomputed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Esporta/importa le tabelle di data/ in CSV")
+    parser.add_argument("action", choices=["export", "import", "list"])
+    parser.add_argument("ticker")
+    parser.add_argument("name", nargs="?")
+    parser.add_argument("csv_path", nargs="?")
+    args = parser.parse_args()
+
+    if args.action == "list":
+        for name in frame_names(args.ticker):
+            paths, mtimes = _source(args.ticker, name)
+            source = "fact table" if name in VIEWS else os.path.basename(paths[0])
+            print(name, _read_table(paths, mtimes, name).shape, source)
+    elif args.action == "export":
+        export_csv(args.ticker, args.name, args.csv_path)
+    else:
+        for column, keys in import_csv(args.ticker, args.name, args.csv_path).items():
+            print(f"{column}: ricalcolate {len(keys)} righe {keys}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""Simulazione di rifinanziamento del debito e costo degli interessi.
+
+Ogni strumento di ``debt_structure`` con una scadenza viene rinnovato alla
+scadenza per lo stesso importo e poi ogni ``refi_tenor`` anni:
+
+- i prestiti a tasso fisso pagano la cedola fino alla scadenza, poi il tasso
+  della curva nell'anno di rinnovo più lo spread di rifinanziamento;
+- quelli a tasso variabile pagano ogni anno EURIBOR più il proprio spread.
+
+La curva EURIBOR va linearmente da ``euribor_start`` (anno base) a
+``euribor_end`` (ultimo anno) e ogni scenario la sposta in parallelo di
+``shifts`` punti base. Tutti gli scenari si calcolano insieme come array
+``scenari x strumenti x anni``. Gli altri oneri finanziari (leasing IFRS16,
+commissioni), non indicizzati ai tassi di mercato, sono calibrati
+sull'Interest Cover dell'anno base e tenuti costanti.
+
+Per ogni scenario e anno si ricavano:
+
+- oneri finanziari e Interest Cover (EBITDA / oneri);
+- debito netto e ND/EBITDA: il debito si riduce del FCF di piano meno i
+  dividendi, e aumenta del maggior costo degli interessi (al netto delle
+  imposte) rispetto allo scenario senza spostamento, già implicito nel piano.
+
+Oltre gli anni di piano EBITDA, FCF e dividendi crescono del tasso
+``growth``. La simulazione è in cache per specifica (``DebtSpec``).
+"""
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from inwit_data import load_facts
+from inwit_profiling import span
+
+_SPREAD_RE = re.compile(r"EURIBOR\s*\+\s*(\d+(?:[.,]\d+)?)\s*bps", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Instrument:
+    name: str
+    amount: float      # €M
+    rate: float        # cedola fissa (frazione), nan per i variabili
+    spread: float      # spread sull'EURIBOR dei variabili (frazione)
+    maturity: int
+
+    @property
+    def floating(self):
+        return self.rate != self.rate
+
+
+@dataclass(frozen=True)
+class DebtSpec:
+    instruments: tuple    # Instrument con scadenza
+    base_year: int
+    years: tuple          # anni simulati
+    ebitda: tuple         # per anno, €M
+    fcf: tuple            # FCF di piano per anno, €M
+    dividends: tuple      # dividendi pagati per anno, €M
+    growth: float         # crescita oltre gli anni di piano
+    net_debt: float       # debito netto nell'anno base, €M
+    other_interest: float  # oneri non indicizzati (leasing...), €M annui
+    euribor_start: float
+    euribor_end: float
+    refi_spread: float    # spread dei nuovi prestiti a tasso fisso
+    refi_tenor: int       # durata dei prestiti rinnovati (anni)
+    tax_rate: float
+    shifts: tuple         # spostamenti paralleli della curva, in punti base
+
+
+@dataclass(frozen=True)
+class DebtSimulation:
+    spec: DebtSpec
+    shifts: np.ndarray               # (scenari,), punti base
+    instrument_interest: np.ndarray  # (scenari, strumenti, anni), €M
+    interest: np.ndarray             # (scenari, anni), oneri totali €M
+    cover: np.ndarray                # (scenari, anni)
+    net_debt: np.ndarray             # (scenari, anni), €M
+    leverage: np.ndarray             # (scenari, anni), ND/EBITDA
+
+    def scenario(self, shift):
+        """Indice dello scenario più vicino a ``shift`` punti base."""
+        return int(np.abs(self.shifts - shift).argmin())
+
+    def frame(self, shift):
+        """Proiezione anno per anno di uno scenario."""
+        s = self.scenario(shift)
+        df = pd.DataFrame({"Anno": list(self.spec.years)})
+        for i, instrument in enumerate(self.spec.instruments):
+            df[f"Interessi {instrument.name} (€M)"] = self.instrument_interest[s, i]
+        df["Oneri Finanziari (€M)"] = self.interest[s]
+        df["Interest Cover"] = self.cover[s]
+        df["Debito Netto (€M)"] = self.net_debt[s]
+        df["ND/EBITDA"] = self.leverage[s]
+        return df
+
+    def scenarios_frame(self, metric):
+        """``metric`` (``interest``, ``cover``, ``leverage``) di tutti gli scenari: righe = anni, colonne = bps."""
+        return pd.DataFrame(getattr(self, metric).T, index=pd.Index(self.spec.years, name="Anno"),
+                            columns=pd.Index(self.shifts, name="Shift (bps)"))
+
+
+def parse_instruments(df_debt_structure):
+    """Strumenti con scadenza e tasso noti; righe senza scadenza (leasing) escluse."""
+    instruments = []
+    for row in df_debt_structure.to_dict("records"):
+        maturity = str(row["Scadenza"]).strip()
+        if not maturity.isdigit():
+            continue
+        rate_text = str(row["Tasso (%)"])
+        match = _SPREAD_RE.search(rate_text)
+        if match:
+            rate, spread = np.nan, float(match.group(1).replace(",", ".")) / 10_000
+        else:
+            try:
+                rate, spread = float(rate_text.replace(",", ".")) / 100, 0.0
+            except ValueError:
+                continue
+        instruments.append(Instrument(row["Strumento"], float(row["Importo (€M)"]), rate, spread, int(maturity)))
+    return tuple(instruments)
+
+
+def _extend(values, years, growth):
+    """Valori per ``years`` da un dizionario anno -> valore, oltre l'ultimo anno noto a crescita ``growth``."""
+    last_year = max(values)
+    return tuple(
+        float(values[y]) if y in values else float(values[last_year]) * (1 + growth) ** (y - last_year)
+        for y in years
+    )
+
+
+def _curve(spec, shifts):
+    """EURIBOR per scenario e anno dal base_year all'ultimo anno: (scenari, 1 + anni)."""
+    steps = np.linspace(0.0, 1.0, len(spec.years) + 1)
+    base = spec.euribor_start + (spec.euribor_end - spec.euribor_start) * steps
+    return np.maximum(base[None, :] + shifts[:, None] / 10_000, 0.0)
+
+
+def financial_interest(instruments, euribor):
+    """Interessi (€M) nell'anno base, con i tassi correnti."""
+    return sum(i.amount * ((euribor + i.spread) if i.floating else i.rate) for i in instruments)
+
+
+def default_spec(df_debt_analysis, df_debt_structure, df_dps_projection, company,
+                 horizon=6, growth=0.03, euribor_start=0.035, euribor_end=0.0275,
+                 refi_spread=0.0125, refi_tenor=7, tax_rate=0.24,
+                 shifts=tuple(range(-200, 301, 25))):
+    """Specifica dai dati del titolo: anno base = ultimo anno di ``debt_analysis``."""
+    last = df_debt_analysis.iloc[-1]
+    base_year = int(last["Anno"])
+    years = tuple(range(base_year + 1, base_year + 1 + horizon))
+    instruments = parse_instruments(df_debt_structure)
+
+    facts, _ = load_facts(company["ticker"])
+    plan = facts[facts["status"] != "actual"]
+    ebitda = dict(zip(plan.loc[plan["metric"] == "ebitda", "year"].astype(int),
+                      plan.loc[plan["metric"] == "ebitda", "value"]))
+    fcf = dict(zip(plan.loc[plan["metric"] == "fcf", "year"].astype(int),
+                   plan.loc[plan["metric"] == "fcf", "value"]))
+    ebitda.setdefault(base_year, float(last["EBITDA (€M)"]))
+    shares = facts[facts["metric"] == "azioni"].sort_values("year")["value"].iloc[-1]
+    dps = dict(zip(df_dps_projection["Anno"].astype(int), df_dps_projection["DPS (€)"] * shares))
+
+    total_interest = float(last["EBITDA (€M)"]) / float(last["Interest Cover"])
+    other_interest = max(total_interest - financial_interest(instruments, euribor_start), 0.0)
+    return DebtSpec(
+        instruments=instruments,
+        base_year=base_year,
+        years=years,
+        ebitda=_extend(ebitda, years, growth),
+        fcf=_extend(fcf, years, growth) if fcf else tuple(0.0 for _ in years),
+        dividends=_extend(dps, years, growth),
+        growth=growth,
+        net_debt=float(last["Debito Netto (€M)"]),
+        other_interest=other_interest,
+        euribor_start=euribor_start,
+        euribor_end=euribor_end,
+        refi_spread=refi_spread,
+        refi_tenor=refi_tenor,
+        tax_rate=tax_rate,
+        shifts=tuple(shifts),
+    )
+
+
+def simulate_debt(spec):
+    """Simulazione di tutti gli scenari (senza cache)."""
+    shifts = np.asarray(spec.shifts, dtype=float)
+    years = np.asarray(spec.years)
+    curve = _curve(spec, shifts)                                   # (S, 1 + Y)
+    amount = np.array([i.amount for i in spec.instruments])         # (I,)
+    coupon = np.array([i.rate for i in spec.instruments])
+    spread = np.array([i.spread for i in spec.instruments])
+    maturity = np.array([i.maturity for i in spec.instruments])
+    floating = np.isnan(coupon)
+
+    # Anno dell'ultimo rinnovo prima di ciascun anno: scadenza, scadenza + tenor, ...
+    elapsed = years[None, :] - 1 - maturity[:, None]                # (I, Y)
+    reset_year = maturity[:, None] + spec.refi_tenor * np.maximum(elapsed // spec.refi_tenor, 0)
+    reset_index = np.clip(reset_year - spec.base_year, 0, len(years))
+    refinanced = years[None, :] > maturity[:, None]                 # (I, Y)
+
+    euribor_now = curve[:, 1:][:, None, :]                          # (S, 1, Y)
+    euribor_reset = curve[:, reset_index]                           # (S, I, Y)
+    fixed_rate = np.where(refinanced[None], euribor_reset + spec.refi_spread, coupon[None, :, None])
+    rate = np.where(floating[None, :, None], euribor_now + spread[None, :, None], fixed_rate)
+    instrument_interest = amount[None, :, None] * rate              # (S, I, Y)
+
+    interest = instrument_interest.sum(axis=1) + spec.other_interest
+    ebitda = np.asarray(spec.ebitda)
+    cover = ebitda[None, :] / interest
+
+    # Maggior costo rispetto allo scenario senza spostamento (già nel FCF di piano)
+    reference = interest[int(np.abs(shifts).argmin())]
+    extra = (interest - reference[None, :]) * (1 - spec.tax_rate)
+    change = np.asarray(spec.dividends) - np.asarray(spec.fcf)
+    net_debt = spec.net_debt + np.cumsum(change[None, :] + extra, axis=1)
+    leverage = net_debt / ebitda[None, :]
+    return DebtSimulation(spec, shifts, instrument_interest, interest, cover, net_debt, leverage)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _simulate_cached(spec):
+    simulation = simulate_debt(spec)
+    for array in (simulation.instrument_interest, simulation.interest, simulation.cover,
+                  simulation.net_debt, simulation.leverage):
+        array.flags.writeable = False
+    return simulation
+
+
+def debt_simulation(spec):
+    """Come ``simulate_debt``, dalla cache se la specifica è già stata simulata."""
+    with span("compute", "debt"):
+        return _simulate_cached(spec)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Colonne derivate delle tabelle, ricalcolate in modo incrementale.
+
+Ogni colonna derivata dichiara le colonne di input e quante righe
+precedenti le servono (``lag``: 0 per i rapporti sulla stessa riga, 1 per
+le variazioni anno su anno). Quando una tabella cambia (un anno aggiunto,
+una stima rivista) ``refresh_derived`` confronta la nuova versione con la
+precedente, riga per riga sulla colonna chiave (la prima, l'anno), e
+ricalcola solo le celle i cui input sono cambiati, o quelle il cui
+predecessore è cambiato per le colonne con ``lag``. Le altre celle sono
+copiate dalla versione precedente.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class DerivedColumn:
+    inputs: tuple
+    compute: Callable  # funzione(df) -> Series, sulle sole righe passate
+    lag: int = 0       # righe precedenti da cui dipende ciascuna riga
+
+
+# Colonne derivate per tabella
+DERIVED_COLUMNS = {
+    "dps": {
+        # Variazioni percentuali DPS (ordinario, escludendo extra 2019)
+        "Variazione %": DerivedColumn(
+            ("DPS Ordinario (€)",),
+            lambda df: (df["DPS Ordinario (€)"].pct_change() * 100).fillna(0),
+            lag=1,
+        ),
+    },
+    "payout": {
+        "Payout Ratio EPS (%)": DerivedColumn(
+            ("DPS (€)", "EPS (€)"),
+            lambda df: (df["DPS (€)"] / df["EPS (€)"]) * 100,
+        ),
+        "FCF Cover (x)": DerivedColumn(
+            ("FCF per Share (€)", "DPS (€)"),
+            lambda df: df["FCF per Share (€)"] / df["DPS (€)"],
+        ),
+    },
+    "fcf_analysis": {
+        # Dividendi totali pagati: DPS ordinario x azioni in circolazione
+        "Dividendi Totali (€M)": DerivedColumn(
+            ("DPS (€)", "Azioni (M)"),
+            lambda df: (df["DPS (€)"] * df["Azioni (M)"]).round(0),
+        ),
+        "Copertura FCF": DerivedColumn(
+            ("FCF (€M)", "DPS (€)", "Azioni (M)"),
+            lambda df: df["FCF (€M)"] / (df["DPS (€)"] * df["Azioni (M)"]),
+        ),
+    },
+}
+
+
+def _changed_inputs(raw, previous, inputs):
+    """Righe di ``raw`` nuove o con almeno un input diverso dalla versione precedente."""
+    key = raw.columns[0]
+    old = previous.set_index(key).reindex(raw[key])[list(inputs)].to_numpy()
+    new = raw[list(inputs)].to_numpy()
+    same = (old == new) | (pd.isna(old) & pd.isna(new))
+    return ~same.all(axis=1)
+
+
+def _moved_neighbours(raw, previous, lag):
+    """Righe il cui predecessore (fino a ``lag`` righe prima) non è più lo stesso."""
+    key = raw.columns[0]
+    old_position = pd.Series(np.arange(len(previous), dtype=float), index=previous[key])
+    position = old_position.reindex(raw[key]).to_numpy()
+    rows = np.arange(len(raw))
+    moved = np.zeros(len(raw), dtype=bool)
+    for k in range(1, lag + 1):
+        before = np.concatenate([np.full(k, np.nan), position[:-k]])
+        expected = position - k
+        at_start = (rows < k) & (expected < 0)
+        moved |= ~((before == expected) | at_start)
+    return moved
+
+
+def _dirty_rows(raw, previous, column_name, spec):
+    """Righe in cui ``column_name`` va ricalcolata rispetto a ``previous``."""
+    if previous is None or column_name not in previous.columns:
+        return np.ones(len(raw), dtype=bool)
+    changed = _changed_inputs(raw, previous, spec.inputs)
+    dirty = changed.copy()
+    for k in range(1, spec.lag + 1):
+        dirty[k:] |= changed[:-k]
+    if spec.lag:
+        dirty |= _moved_neighbours(raw, previous, spec.lag)
+    return dirty
+
+
+def _runs(mask):
+    """Intervalli ``[inizio, fine)`` delle sequenze di ``True`` in ``mask``."""
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], mask.astype(np.int8), [0]])))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def refresh_derived(raw, name, previous=None):
+    """Aggiunge a ``raw`` le colonne derivate della tabella ``name``.
+
+    ``previous`` è la versione precedente della tabella (colonne derivate
+    comprese). Restituisce il DataFrame e, per ogni colonna derivata, le
+    chiavi delle righe effettivamente ricalcolate.
+    """
+    df = raw.copy()
+    key = raw.columns[0]
+    recomputed = {}
+    for column_name, spec in DERIVED_COLUMNS.get(name, {}).items():
+        dirty = _dirty_rows(raw, previous, column_name, spec)
+        if dirty.all():
+            values = spec.compute(raw)
+        else:
+            values = previous.set_index(key)[column_name].reindex(raw[key]).set_axis(raw.index)
+            for start, end in _runs(dirty):
+                # Finestra con le righe precedenti necessarie; si tengono solo quelle da ricalcolare
+                window = raw.iloc[max(start - spec.lag, 0):end]
+                values.iloc[start:end] = spec.compute(window).iloc[-(end - start):].to_numpy()
+        df[column_name] = values
+        recomputed[column_name] = raw[key][dirty].tolist()
+    return df, recomputed
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Esportazione statica della dashboard in un bundle HTML.
+
+Uso:  python inwit_export.py [--ticker INWIT.MI] [--out export] [--inline-js]
+
+Esegue l'app in modalità headless (``AppTest``), visita ogni voce del
+selettore di sezione e traduce gli elementi disegnati in HTML statico:
+testi e blocchi HTML, metriche, tabelle, grafici Plotly (spec JSON incorporate
+nella pagina), expander come ``<details>`` aperti o chiusi come nell'app, e
+tutte le schede delle ``st.tabs`` una dopo l'altra (l'analisi completa viene
+disegnata con tutte le schede e le sezioni aperte). I widget non sono
+interattivi: la pagina riporta il valore di default con cui è stata
+calcolata la sezione.
+
+Il bundle (``index.html`` più ``plotly.min.js``, oppure un solo file con
+``--inline-js``) si può servire da un qualunque web server o CDN, senza
+sessioni Streamlit. Header e note finali comuni a tutte le sezioni compaiono
+una volta sola.
+
+I colori segnaposto del tema Streamlit (``#000001``...) che nell'app sostituisce
+il frontend vengono convertiti nella palette del tema chiaro; un segnaposto
+rimasto in un grafico interrompe l'esportazione.
+"""
+import argparse
+import html
+import json
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+from markdown_it import MarkdownIt
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(ROOT, "inwit-dividend-app.py")
+
+_MARKDOWN = MarkdownIt("commonmark", {"html": False, "breaks": False}).enable("table").enable("strikethrough")
+_MARKDOWN_HTML = MarkdownIt("commonmark", {"html": True, "breaks": False}).enable("table").enable("strikethrough")
+
+# Palette categoriale del tema chiaro di Streamlit, per i segnaposto #000001...#000010
+THEME_COLORS = {
+    f"#{i:06d}": color
+    for i, color in enumerate(["#0068c9", "#83c9ff", "#ff2b2b", "#ffabab", "#29b09d",
+                               "#7defa1", "#ff8700", "#ffd16a", "#6d3fc0", "#d5dae5"], start=1)
+}
+# Tutti i segnaposto del template "streamlit" (#000001...#000040)
+_PLACEHOLDER_RE = re.compile(r"#0000(?:0[1-9]|[1-3][0-9]|40)\b", re.IGNORECASE)
+
+PAGE_CSS = """
+body { font-family: "Source Sans Pro", -apple-system, "Segoe UI", Roboto, sans-serif; color: #31333f;
+       max-width: 1200px; margin: 0 auto; padding: 1rem 2rem 3rem; line-height: 1.5; }
+nav.sections { position: sticky; top: 0; background: #fff; padding: 0.5rem 0; border-bottom: 1px solid #e6e6e6;
+               z-index: 10; display: flex; flex-wrap: wrap; gap: 0.4rem 1rem; }
+nav.sections a { text-decoration: none; color: #1f77b4; }
+section.app-section { padding-top: 1.5rem; border-top: 2px solid #e6e6e6; margin-top: 1.5rem; }
+.row { display: flex; gap: 1rem; flex-wrap: wrap; }
+.row > .col { flex: 1 1 0; min-width: 260px; }
+.metric { padding: 0.5rem 0; } .metric-label { font-size: 0.875rem; color: #555; }
+.metric-value { font-size: 1.9rem; } .metric-delta { font-size: 0.875rem; color: #09ab3b; }
+.caption { font-size: 0.85rem; color: #6b6f7b; }
+.info { background: #e8f1fb; border-radius: 0.5rem; padding: 0.75rem 1rem; margin: 0.5rem 0; }
+.param { font-size: 0.85rem; color: #6b6f7b; }
+details { border: 1px solid #e6e6e6; border-radius: 0.5rem; padding: 0.5rem 1rem; margin: 0.5rem 0; }
+details > summary { cursor: pointer; font-weight: 600; }
+.tab > h3.tab-label { border-bottom: 2px solid #ff4b4b; display: inline-block; padding-bottom: 0.2rem; }
+table.dataframe { border-collapse: collapse; font-size: 0.85rem; margin: 0.5rem 0; }
+table.dataframe th, table.dataframe td { border: 1px solid #e6e6e6; padding: 0.25rem 0.5rem; text-align: right; }
+table.dataframe th { background: #f8f9fa; }
+.chart { width: 100%; min-height: 450px; }
+"""
+
+
+def _markdown(body, allow_html):
+    return (_MARKDOWN_HTML if allow_html else _MARKDOWN).render(body)
+
+
+def _format_cell(value):
+    if isinstance(value, float):
+        return "" if value != value else f"{value:,.2f}"
+    return value
+
+
+class _Renderer:
+    """Converte l'albero di elementi di ``AppTest`` in frammenti HTML."""
+
+    def __init__(self):
+        self.figures = 0
+
+    def element(self, node):
+        kind = type(node).__name__
+        method = getattr(self, f"_render_{kind}", None)
+        if method is not None:
+            return method(node)
+        if getattr(node, "type", "") == "plotly_chart":
+            return self._render_plotly(node)
+        return "".join(self.element(child) for child in self.children(node))
+
+    @staticmethod
+    def children(node):
+        children = getattr(node, "children", None)
+        return list(children.values()) if isinstance(children, dict) else []
+
+    def _render_Title(self, node):
+        return f"<h1>{html.escape(node.value)}</h1>"
+
+    def _render_Header(self, node):
+        return f"<h2>{html.escape(node.value)}</h2>"
+
+    def _render_Subheader(self, node):
+        return f"<h3>{html.escape(node.value)}</h3>"
+
+    def _render_Markdown(self, node):
+        return _markdown(node.value, node.proto.allow_html)
+
+    def _render_Caption(self, node):
+        return f'<div class="caption">{_markdown(node.value, node.proto.allow_html)}</div>'
+
+    def _render_Info(self, node):
+        return f'<div class="info">{_markdown(node.value, False)}</div>'
+
+    _render_Success = _render_Warning = _render_Error = _render_Info
+
+    def _render_Metric(self, node):
+        delta = f'<div class="metric-delta">{html.escape(node.delta)}</div>' if node.delta else ""
+        return (f'<div class="metric"><div class="metric-label">{html.escape(node.label)}</div>'
+                f'<div class="metric-value">{html.escape(node.value)}</div>{delta}</div>')
+
+    def _render_Dataframe(self, node):
+        df = node.value
+        show_index = not isinstance(df.index, pd.RangeIndex)
+        return df.map(_format_cell).to_html(index=show_index, border=0, na_rep="")
+
+    def _render_plotly(self, node):
+        self.figures += 1
+        # Streamlit 1.37 mette la figura in ``spec``, la 1.30 in ``figure.spec``
+        spec = json.loads(getattr(node.proto, "spec", "") or node.proto.figure.spec)
+        payload = json.dumps({"data": spec.get("data", []), "layout": spec.get("layout", {})},
+                             separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+        payload = _PLACEHOLDER_RE.sub(lambda m: THEME_COLORS.get(m.group(0), m.group(0)), payload)
+        leftover = _PLACEHOLDER_RE.search(payload)
+        if leftover:
+            raise RuntimeError(f"Colore segnaposto del tema Streamlit non convertito: {leftover.group(0)}")
+        div_id = f"fig-{self.figures}"
+        return (f'<div id="{div_id}" class="chart"></div>'
+                f'<script>(function(s){{Plotly.newPlot("{div_id}",s.data,s.layout,'
+                f'{{responsive:true,displaylogo:false}});}})({payload});</script>')
+
+    def _render_widget(self, node):
+        value = node.value
+        if isinstance(value, (tuple, list)):
+            value = " – ".join(str(v) for v in value)
+        return f'<div class="param">{html.escape(node.label)}: <strong>{html.escape(str(value))}</strong></div>'
+
+    _render_Slider = _render_SelectSlider = _render_Selectbox = _render_widget
+    _render_NumberInput = _render_TextInput = _render_Radio = _render_Checkbox = _render_widget
+
+    def _render_Column(self, node):
+        return f'<div class="col">{"".join(self.element(c) for c in self.children(node))}</div>'
+
+    def _render_Tab(self, node):
+        inner = "".join(self.element(c) for c in self.children(node))
+        return f'<div class="tab"><h3 class="tab-label">{html.escape(node.label)}</h3>{inner}</div>'
+
+    def _render_Block(self, node):
+        inner = "".join(self.element(c) for c in self.children(node))
+        if node.type == "horizontal":
+            return f'<div class="row">{inner}</div>'
+        if node.type == "expandable":
+            expandable = node.proto.expandable
+            is_open = " open" if expandable.expanded else ""
+            return f"<details{is_open}><summary>{html.escape(expandable.label)}</summary>{inner}</details>"
+        return f"<div>{inner}</div>"
+
+
+def _common_prefix(lists):
+    prefix = []
+    for items in zip(*lists):
+        if any(item != items[0] for item in items):
+            break
+        prefix.append(items[0])
+    return prefix
+
+
+def render_sections(ticker=None, app_path=APP):
+    """Disegna tutte le sezioni; restituisce (frammenti per sezione, numero di grafici)."""
+    from streamlit.testing.v1 import AppTest
+
+    from inwit_sections.full_analysis import RENDER_ALL_KEY
+
+    at = AppTest.from_file(app_path, default_timeout=120)
+    # Report completo: tutte le schede e tutte le sezioni aperte, non paginate
+    at.session_state[RENDER_ALL_KEY] = True
+    at.run()
+    if ticker:
+        label = next(o for o in at.selectbox(key="ticker").options if ticker in o)
+        at.selectbox(key="ticker").select(label).run()
+
+    renderer = _Renderer()
+    sections = {}
+    for option in at.selectbox(key="section").options:
+        at.selectbox(key="section").select(option).run()
+        if at.exception:
+            raise RuntimeError(f"{option}: {at.exception[0].message}")
+        sections[option] = [renderer.element(node) for node in _Renderer.children(at.main)]
+    return sections, renderer.figures
+
+
+def build_page(sections, plotly_js):
+    """Pagina unica: header e note comuni una volta, poi una ``<section>`` per voce del menu."""
+    fragments = list(sections.values())
+    header = _common_prefix(fragments)
+    footer = _common_prefix([f[len(header):][::-1] for f in fragments])[::-1]
+
+    nav, body = [], []
+    for i, (option, items) in enumerate(sections.items()):
+        anchor = f"sezione-{i + 1}"
+        nav.append(f'<a href="#{anchor}">{html.escape(option)}</a>')
+        inner = items[len(header):len(items) - len(footer)]
+        body.append(f'<section class="app-section" id="{anchor}"><h2>{html.escape(option)}</h2>{"".join(inner)}</section>')
+
+    title_match = re.search(r"<h1>(.*?)</h1>", "".join(header))
+    title = title_match.group(1) if title_match else "Analisi Dividendi"
+    generated = datetime.now().strftime("%d/%m/%Y %H:%M")
+    return (
+        "<!DOCTYPE html>\n<html lang=\"it\"><head><meta charset=\"utf-8\">"
+        "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">"
+        f"<title>{title}</title><style>{PAGE_CSS}</style>{plotly_js}</head><body>"
+        f"{''.join(header)}<nav class=\"sections\">{''.join(nav)}</nav>"
+        f"{''.join(body)}{''.join(footer)}"
+        f"<p class=\"caption\">Versione statica generata il {generated}.</p>"
+        "</body></html>\n"
+    )
+
+
+def export(out_dir, ticker=None, inline_js=False, app_path=APP):
+    """Scrive il bundle in ``out_dir``; restituisce il percorso di ``index.html``."""
+    from plotly.offline import get_plotlyjs
+
+    sections, figures = render_sections(ticker, app_path)
+    os.makedirs(out_dir, exist_ok=True)
+    if inline_js:
+        plotly_js = f"<script>{get_plotlyjs()}</script>"
+    else:
+        with open(os.path.join(out_dir, "plotly.min.js"), "w", encoding="utf-8") as file:
+            file.write(get_plotlyjs())
+        plotly_js = '<script src="plotly.min.js"></script>'
+
+    index = os.path.join(out_dir, "index.html")
+    with open(index, "w", encoding="utf-8") as file:
+        file.write(build_page(sections, plotly_js))
+    print(f"{len(sections)} sezioni, {figures} grafici -> {index} ({os.path.getsize(index) / 1024:.0f} KiB)")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Esporta tutte le sezioni in un bundle HTML statico")
+    parser.add_argument("--ticker", help="titolo da esportare (default: quello del registro)")
+    parser.add_argument("--out", default=os.path.join(ROOT, "export"))
+    parser.add_argument("--inline-js", action="store_true", help="incorpora plotly.js in index.html")
+    args = parser.parse_args()
+    export(args.out, args.ticker, args.inline_js)
+
+
+if __name__ == "__main__":
+    main()
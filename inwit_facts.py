@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""Fact table normalizzata e viste tabellari derivate.
+
+I dati annuali di un titolo sono un'unica tabella lunga, un fatto per riga:
+
+    entity (ticker) | year | metric | value | status
+
+con ``entity``, ``metric`` e ``status`` categoriche, ``year`` a 16 bit e
+``value`` float64. ``status`` distingue consuntivo, stima e piano
+(``actual`` < ``estimate`` < ``plan``). Ogni numero è memorizzato una volta
+sola: EBITDA, DPS, FCF non sono più ripetuti (e talvolta discordanti) in
+più tabelle.
+
+Le tabelle lette dalle sezioni (``dps``, ``fin_clean``, ``projections``...)
+sono viste dichiarate in ``VIEWS``:
+
+- ``YearView``: una riga per anno, una colonna per metrica;
+- ``MetricView``: una riga per metrica, una colonna per anno.
+
+Gli anni di una vista sono quelli in cui tutte le sue metriche hanno un
+valore. I pochi testi descrittivi (fase o evento di un anno, commento di
+una metrica) stanno in una tabella di annotazioni ``entity | scope | key |
+attribute | text``.
+"""
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+STATUSES = ["actual", "estimate", "plan"]
+FACT_COLUMNS = ["entity", "year", "metric", "value", "status"]
+ANNOTATION_COLUMNS = ["entity", "scope", "key", "attribute", "text"]
+
+
+@dataclass(frozen=True)
+class YearView:
+    key: str                                        # colonna dell'anno
+    columns: dict                                   # colonna -> metrica
+    dtypes: dict = field(default_factory=dict)      # colonna -> dtype (default float64)
+    year_format: str = "int"                        # vedi _year_label
+    year_attributes: dict = field(default_factory=dict)  # colonna -> annotazione dell'anno
+    status_column: str = None
+    status_labels: dict = field(default_factory=dict)    # status -> etichetta
+
+
+@dataclass(frozen=True)
+class MetricView:
+    label: str                                      # colonna con il nome della metrica
+    rows: dict                                      # etichetta -> metrica
+    year_format: str = "status"
+    metric_attributes: dict = field(default_factory=dict)  # colonna -> annotazione della metrica
+
+
+VIEWS = {
+    "business_metrics": YearView(
+        key="Anno",
+        columns={"Numero Torri": "numero_torri", "Tenancy Ratio": "tenancy_ratio",
+                 "Ricavi per Torre (€K)": "ricavi_per_torre"},
+        dtypes={"Numero Torri": "int64", "Ricavi per Torre (€K)": "int64"},
+    ),
+    "debt_analysis": YearView(
+        key="Anno",
+        columns={"Debito Netto (€M)": "debito_netto", "EBITDA (€M)": "ebitda",
+                 "ND/EBITDA": "nd_ebitda", "Target ND/EBITDA": "target_nd_ebitda",
+                 "Interest Cover": "interest_cover"},
+    ),
+    "dps": YearView(
+        key="Anno Esercizio",
+        columns={"DPS (€)": "dps", "DPS Ordinario (€)": "dps_ordinario",
+                 "DPS Straordinario (€)": "dps_straordinario"},
+        status_column="Tipo",
+        status_labels={"actual": "Storico", "estimate": "Atteso", "plan": "Piano"},
+    ),
+    "dps_projection": YearView(
+        key="Anno",
+        columns={"DPS (€)": "dps_ordinario"},
+        status_column="Tipo",
+        status_labels={"actual": "Storico", "estimate": "Confermato", "plan": "Piano"},
+    ),
+    "fcf_analysis": YearView(
+        key="Anno",
+        # DPS ordinario: il dividendo straordinario 2019 non grava sul FCF ricorrente
+        columns={"FCF (€M)": "fcf", "DPS (€)": "dps_ordinario", "Azioni (M)": "azioni"},
+        dtypes={"Azioni (M)": "int64"},
+    ),
+    "fin": MetricView(
+        label="Metrica",
+        rows={"Ricavi Totali (€M)": "ricavi", "EBITDA (€M)": "ebitda",
+              "EBITDA Margin (%)": "ebitda_margin", "Utile Netto (€M)": "utile_netto",
+              "EPS Diluito (€)": "eps", "Cash Flow Operativo (CFO, €M)": "cfo",
+              "Free Cash Flow (FCF, €M)": "fcf", "Debito Netto (€M)": "debito_netto",
+              "Debito Netto / EBITDA": "nd_ebitda", "Dividendo per Azione (DPS, €)": "dps",
+              "Payout Ratio (%)": "payout_ratio"},
+    ),
+    "fin_clean": YearView(
+        key="Anno",
+        columns={"Ricavi (€M)": "ricavi", "EBITDA (€M)": "ebitda",
+                 "EBITDA Margin (%)": "ebitda_margin", "Utile Netto (€M)": "utile_netto",
+                 "EPS (€)": "eps", "FCF (€M)": "fcf", "DPS (€)": "dps"},
+        year_format="status",
+        year_attributes={"Fase": "fase"},
+    ),
+    "payout": YearView(
+        key="Anno",
+        columns={"EPS (€)": "eps", "DPS (€)": "dps_ordinario", "FCF per Share (€)": "fcf_per_share"},
+    ),
+    "projections": MetricView(
+        label="Metrica",
+        rows={"Ricavi (€M)": "ricavi", "EBITDA (€M)": "ebitda", "EBITDA Margin (%)": "ebitda_margin",
+              "Free Cash Flow (€M)": "fcf", "Net Debt/EBITDA": "nd_ebitda",
+              "DPS (€)": "dps_ordinario", "Dividend Yield (%)": "dividend_yield"},
+        year_format="estimate",
+        metric_attributes={"CAGR 24-26": "cagr_24_26"},
+    ),
+}
+
+
+def _year_label(year, status, year_format):
+    """``int``: 2024; ``status``: "2023", "2024E" se non consuntivo; ``estimate``: sempre "2024E"."""
+    if year_format == "int":
+        return int(year)
+    if year_format == "estimate" or status != "actual":
+        return f"{year}E"
+    return str(year)
+
+
+def _parse_year(label):
+    return int(str(label).rstrip("E"))
+
+
+def _pivot(facts, metrics):
+    """Valori ``anno x metrica`` negli anni in cui tutte le metriche hanno un valore, e status per anno."""
+    subset = facts[facts["metric"].isin(metrics)]
+    wide = subset.pivot(index="year", columns="metric", values="value")
+    wide = wide.reindex(columns=list(dict.fromkeys(metrics))).dropna()
+    status = subset.groupby("year", observed=True)["status"].max().reindex(wide.index)
+    return wide, status
+
+
+def _annotations(annotations, scope, attribute):
+    rows = annotations[(annotations["scope"] == scope) & (annotations["attribute"] == attribute)]
+    return dict(zip(rows["key"], rows["text"]))
+
+
+def build_view(facts, annotations, name):
+    """Tabella ``name`` ricavata dalla fact table."""
+    spec = VIEWS[name]
+    if isinstance(spec, YearView):
+        wide, status = _pivot(facts, list(spec.columns.values()))
+        df = pd.DataFrame({spec.key: [_year_label(y, s, spec.year_format) for y, s in zip(wide.index, status)]})
+        for column, metric in spec.columns.items():
+            df[column] = wide[metric].to_numpy().astype(spec.dtypes.get(column, "float64"))
+        for column, attribute in spec.year_attributes.items():
+            texts = _annotations(annotations, "year", attribute)
+            df[column] = [texts.get(str(year)) for year in wide.index]
+        if spec.status_column:
+            df[spec.status_column] = [spec.status_labels[s] for s in status]
+        return df
+
+    wide, status = _pivot(facts, list(spec.rows.values()))
+    df = pd.DataFrame({spec.label: list(spec.rows)})
+    for year, year_status in zip(wide.index, status):
+        df[_year_label(year, year_status, spec.year_format)] = wide.loc[year].to_numpy()
+    for column, attribute in spec.metric_attributes.items():
+        texts = _annotations(annotations, "metric", attribute)
+        df[column] = [texts.get(metric) for metric in spec.rows.values()]
+    return df
+
+
+def view_to_facts(df, name, facts, entity):
+    """Fatti e annotazioni contenuti in una vista (es. un CSV modificato).
+
+    Restituisce ``(fatti, annotazioni)`` nel formato delle due tabelle. Lo
+    status viene dalla colonna di status della vista se presente, altrimenti
+    resta quello già registrato; per un anno nuovo è "actual", o "estimate"
+    se l'etichetta dell'anno termina con "E".
+    """
+    spec = VIEWS[name]
+    known = {(m, int(y)): s for m, y, s in zip(facts["metric"], facts["year"], facts["status"])}
+    records, notes = [], []
+    if isinstance(spec, YearView):
+        labels = dict(map(reversed, spec.status_labels.items()))
+        for row in df.to_dict("records"):
+            label = row[spec.key]
+            year = _parse_year(label)
+            for column, metric in spec.columns.items():
+                if spec.status_column:
+                    status = labels[row[spec.status_column]]
+                else:
+                    status = known.get((metric, year), "estimate" if str(label).endswith("E") else "actual")
+                records.append((entity, year, metric, float(row[column]), status))
+            for column, attribute in spec.year_attributes.items():
+                notes.append((entity, "year", str(year), attribute, row[column]))
+    else:
+        year_columns = [c for c in df.columns if c != spec.label and c not in spec.metric_attributes]
+        for row in df.to_dict("records"):
+            metric = spec.rows[row[spec.label]]
+            for label in year_columns:
+                year = _parse_year(label)
+                status = known.get((metric, year), "estimate" if str(label).endswith("E") else "actual")
+                records.append((entity, year, metric, float(row[label]), status))
+            for column, attribute in spec.metric_attributes.items():
+                notes.append((entity, "metric", metric, attribute, row[column]))
+    return (normalize_facts(pd.DataFrame(records, columns=FACT_COLUMNS)),
+            normalize_annotations(pd.DataFrame(notes, columns=ANNOTATION_COLUMNS)))
+
+
+def merge(current, update, keys):
+    """Sostituisce in ``current`` le righe con le stesse ``keys`` di ``update`` e aggiunge le nuove."""
+    merged = pd.concat([current.astype(object), update.astype(object)], ignore_index=True)
+    return merged.drop_duplicates(subset=keys, keep="last").reset_index(drop=True)
+
+
+def normalize_facts(df):
+    """Tipi compatti della fact table, ordinata per metrica e anno."""
+    df = df.astype({"entity": "category", "year": "int16", "metric": "category", "value": "float64"})
+    df["status"] = pd.Categorical(df["status"], categories=STATUSES, ordered=True)
+    return df.sort_values(["metric", "year"]).reset_index(drop=True)
+
+
+def normalize_annotations(df):
+    df = df.astype({"entity": "category", "scope": "category", "key": "string",
+                    "attribute": "category", "text": "string"})
+    return df.reset_index(drop=True)
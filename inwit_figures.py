@@ -0,0 +1,767 @@
+# -*- coding: utf-8 -*-
+"""Registro dei grafici Plotly della dashboard, con memoizzazione.
+
+Ogni grafico è prodotto da un builder registrato con ``@figure_builder(nome)``.
+``get_figure(nome, df, **parametri)`` restituisce il grafico dalla cache,
+indicizzata sull'hash delle colonne di input dichiarate dal builder e sui
+suoi parametri: a dati invariati il builder non viene eseguito e la figura viene solo
+ricostruita dal JSON serializzato.
+
+Le impostazioni comuni a tutti i grafici stanno nel template Plotly ``inwit``:
+la posizione delle etichette di barre e linee e la palette che il frontend di
+Streamlit sostituisce con i colori del tema. È una versione ridotta del
+template ``streamlit`` (3,5 KB ripetuti in ogni grafico) che i builder non
+ripetono. Il template è registrato all'import ma non diventa il predefinito
+di Plotly: lo applica ``get_figure`` a ogni grafico in cache e i builder lo
+passano a ``plotly.express``, che ne legge la palette già alla costruzione.
+
+Il JSON in cache è compatto: separatori senza spazi e array numerici
+arrotondati a ``decimals`` cifre decimali dichiarate dal builder (per le
+mappe di calore, alla precisione mostrata) o, altrimenti, a 6 cifre
+significative per ogni valore. plotly 5.18 non produce array binari (``bdata``), quindi i
+numeri restano testo JSON.
+
+``plotly.express`` (~100 ms di import) viene importato dentro i builder che lo
+usano, quindi solo alla prima costruzione effettiva di un grafico.
+"""
+import hashlib
+import json
+import textwrap
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+from plotly.utils import PlotlyJSONEncoder
+
+from inwit_profiling import span
+
+FIGURE_BUILDERS = {}
+FIGURE_COLUMNS = {}  # nome -> colonne lette dal builder (None = tutto il DataFrame)
+FIGURE_DECIMALS = {}  # nome -> cifre decimali degli array numerici (None = 6 significative)
+
+SIGNIFICANT_DIGITS = 6
+
+# Template condiviso: colori segnaposto del tema Streamlit (sostituiti dal
+# frontend) ed etichette di testo sopra barre e punti
+TEMPLATE = "inwit"
+pio.templates[TEMPLATE] = go.layout.Template(
+    layout=dict(colorway=pio.templates["streamlit"].layout.colorway),
+    data=dict(
+        bar=[go.Bar(textposition="outside")],
+        scatter=[go.Scatter(textposition="top center", marker=dict(line=dict(width=0)))],
+    ),
+)
+
+
+def figure_builder(name, columns=None, decimals=None):
+    """Registra un builder ``fn(df, **parametri) -> go.Figure`` sotto ``name``.
+
+    ``columns`` elenca le colonne da cui dipende il grafico: il builder riceve
+    solo quelle e la cache è indicizzata solo sul loro contenuto, così un
+    cambiamento in altre colonne della stessa tabella non lo ricostruisce.
+    ``decimals`` fissa le cifre decimali inviate per gli array numerici.
+    """
+    def register(fn):
+        FIGURE_BUILDERS[name] = fn
+        FIGURE_COLUMNS[name] = list(columns) if columns is not None else None
+        FIGURE_DECIMALS[name] = decimals
+        return fn
+    return register
+
+
+def _round_array(values, decimals):
+    values = np.asarray(values, dtype=float)
+    if decimals is not None:
+        return np.round(values, decimals)
+    # SIGNIFICANT_DIGITS cifre significative per ogni valore: l'ordine di
+    # grandezza è quello del singolo elemento, non del massimo dell'array
+    with np.errstate(all="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values)))
+        scale = 10.0 ** (SIGNIFICANT_DIGITS - 1 - np.where(np.isfinite(magnitude), magnitude, 0))
+        rounded = np.round(values * scale) / scale
+    # 0, nan, inf e i valori fuori scala (subnormali) restano invariati
+    return np.where(np.isfinite(rounded) & (values != 0), rounded, values)
+
+
+def _compact(value, decimals):
+    # Arrotonda gli array di float (anche annidati, es. marker.color) nelle tracce
+    if isinstance(value, dict):
+        return {key: _compact(item, decimals) for key, item in value.items()}
+    if isinstance(value, np.ndarray) and value.dtype.kind == "f":
+        return _round_array(value, decimals)
+    if isinstance(value, (list, tuple)) and value and all(isinstance(v, float) for v in value):
+        return _round_array(value, decimals)
+    if isinstance(value, (list, tuple)):
+        return [_compact(item, decimals) for item in value]
+    return value
+
+
+def compact_json(fig, decimals=None):
+    """JSON della figura senza spazi, con gli array numerici delle tracce arrotondati."""
+    spec = fig.to_plotly_json()
+    spec["data"] = [_compact(trace, decimals) for trace in spec["data"]]
+    return json.dumps(spec, cls=PlotlyJSONEncoder, separators=(",", ":"))
+
+
+def frame_digest(df):
+    """Hash del contenuto (valori, indice, colonne e tipi) di un DataFrame."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    digest.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _figure_json(name, digest, params, _df):
+    # Il DataFrame non entra nella chiave (prefisso "_"): lo rappresenta il suo digest.
+    with span("figure_build", name):
+        fig = FIGURE_BUILDERS[name](_df, **dict(params))
+        fig.update_layout(template=TEMPLATE)
+        return compact_json(fig, FIGURE_DECIMALS[name])
+
+
+def get_figure(name, df, **params):
+    """Grafico ``name`` per ``df``, costruito solo se dati o parametri sono cambiati."""
+    if name not in FIGURE_BUILDERS:
+        raise KeyError(f"Nessun builder registrato per il grafico '{name}'")
+    if FIGURE_COLUMNS[name] is not None:
+        df = df[FIGURE_COLUMNS[name]]
+    with span("figure", name):
+        spec = _figure_json(name, frame_digest(df), tuple(sorted(params.items())), df)
+        # Il JSON proviene da una figura già validata: la ri-validazione è superflua
+        # e convertirebbe in stringhe gli array numerici usati come testo.
+        return go.Figure(json.loads(spec), _validate=False)
+
+
+def _event_label(testo):
+    # Etichetta di un evento (annotazione del titolo) su righe brevi
+    return "<br>".join(textwrap.wrap(testo, 12))
+
+
+def _year_rows(years, anno):
+    # Righe dell'anno ``anno`` anche con etichette come "2024E"
+    return years.astype(str).str.rstrip("E") == str(anno)
+
+
+@figure_builder("dps", columns=['Anno Esercizio', 'DPS Ordinario (€)', 'DPS Straordinario (€)'])
+def build_dps(df, eventi=()):
+    fig_dps = go.Figure()
+
+    # Dividendo ordinario
+    fig_dps.add_trace(go.Bar(
+        x=df['Anno Esercizio'],
+        y=df['DPS Ordinario (€)'],
+        name='Dividendo Ordinario',
+        marker_color='royalblue',
+        text=[f"€{val:.3f}" for val in df['DPS Ordinario (€)']]
+    ))
+
+    # Dividendo straordinario (solo 2019)
+    fig_dps.add_trace(go.Bar(
+        x=df['Anno Esercizio'],
+        y=df['DPS Straordinario (€)'],
+        name='Dividendo Straordinario',
+        marker_color='lightblue',
+        text=[f"€{val:.3f}" if val > 0 else "" for val in df['DPS Straordinario (€)']]
+    ))
+
+    # Eventi del titolo (annotazioni "evento_dividendo" del bundle), sopra la barra dell'anno
+    for anno, testo in eventi:
+        row = df[_year_rows(df['Anno Esercizio'], anno)]
+        if row.empty:
+            continue
+        fig_dps.add_annotation(
+            x=row['Anno Esercizio'].iloc[0],
+            y=float(row['DPS Ordinario (€)'].iloc[0] + row['DPS Straordinario (€)'].iloc[0]),
+            text=_event_label(testo),
+            showarrow=True,
+            arrowcolor="green",
+            font=dict(size=10),
+            ax=20, ay=-40
+        )
+
+    fig_dps.update_layout(
+        title=f"Dividendo per Azione: Ordinario vs Straordinario "
+              f"({df['Anno Esercizio'].min()}-{df['Anno Esercizio'].max()})",
+        barmode='stack',
+        xaxis_title="Anno Esercizio",
+        yaxis_title="Dividendo per Azione (€)",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig_dps
+
+
+@figure_builder("growth", columns=['Anno Esercizio', 'Variazione %'])
+def build_growth(df, crescita=None):
+    import plotly.express as px
+
+    df_growth = df[df['Variazione %'] != 0]
+
+    fig_growth = px.bar(
+        df_growth,
+        x='Anno Esercizio',
+        y='Variazione %',
+        title="Crescita Percentuale Annua del Dividendo Ordinario",
+        text='Variazione %',
+        color='Variazione %',
+        color_continuous_scale='viridis',
+        template=TEMPLATE,
+    )
+
+    fig_growth.update_traces(texttemplate='%{text:.1f}%')
+    fig_growth.update_layout(
+        xaxis_title="Anno",
+        yaxis_title="Variazione % Anno su Anno"
+    )
+
+    # Linea della crescita programmata
+    if crescita is not None:
+        fig_growth.add_hline(
+            y=crescita * 100,
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Target: {crescita:.1%} annuo"
+        )
+    return fig_growth
+
+
+@figure_builder("revenue", columns=['Anno', 'Ricavi (€M)', 'EBITDA (€M)'])
+def build_revenue(df, eventi=()):
+    fig_revenue = go.Figure()
+
+    # Ricavi (barre)
+    fig_revenue.add_trace(go.Bar(
+        x=df['Anno'],
+        y=df['Ricavi (€M)'],
+        name='Ricavi',
+        marker_color='lightblue',
+        text=df['Ricavi (€M)'],
+        texttemplate='%{text:.1f}M'
+    ))
+
+    # EBITDA (linea)
+    fig_revenue.add_trace(go.Scatter(
+        x=df['Anno'],
+        y=df['EBITDA (€M)'],
+        mode='lines+markers',
+        name='EBITDA',
+        line=dict(color='green', width=3),
+        yaxis='y2'
+    ))
+
+    title = "Ricavi ed EBITDA"
+    for anno, testo in eventi:
+        row = df[_year_rows(df['Anno'], anno)]
+        if row.empty:
+            continue
+        fig_revenue.add_annotation(
+            x=row['Anno'].iloc[0], y=float(row['Ricavi (€M)'].iloc[0]),
+            text=_event_label(testo),
+            showarrow=True,
+            font=dict(color="red"),
+            ax=0, ay=-40
+        )
+        title = f"Ricavi ed EBITDA: Impatto {testo} {anno}"
+
+    fig_revenue.update_layout(
+        title=title,
+        xaxis_title="Anno",
+        yaxis_title="Ricavi (€M)",
+        yaxis2=dict(
+            title="EBITDA (€M)",
+            overlaying="y",
+            side="right"
+        )
+    )
+    return fig_revenue
+
+
+@figure_builder("margin", columns=['Anno', 'EBITDA Margin (%)'])
+def build_margin(df, obiettivo=None):
+    import plotly.express as px
+
+    fig_margin = px.line(
+        df,
+        x='Anno',
+        y='EBITDA Margin (%)',
+        title="Evoluzione EBITDA Margin",
+        markers=True,
+        text='EBITDA Margin (%)',
+        line_shape='spline',
+        template=TEMPLATE,
+    )
+
+    fig_margin.update_traces(
+        texttemplate='%{text:.1f}%'
+    )
+
+    if obiettivo is not None:
+        fig_margin.add_hline(
+            y=obiettivo,
+            line_dash="dash",
+            line_color="orange",
+            annotation_text=f"Target >{obiettivo:g}%"
+        )
+
+    fig_margin.update_layout(
+        yaxis_title="EBITDA Margin (%)",
+        yaxis=dict(range=[80, 95])
+    )
+    return fig_margin
+
+
+@figure_builder("torri", columns=['Anno', 'Numero Torri'])
+def build_torri(df):
+    import plotly.express as px
+
+    fig_torri = px.bar(
+        df,
+        x='Anno',
+        y='Numero Torri',
+        title="Evoluzione Numero Torri Gestite",
+        text='Numero Torri',
+        color='Numero Torri',
+        color_continuous_scale='Blues',
+        template=TEMPLATE,
+    )
+    fig_torri.update_traces(texttemplate='%{text:,}')
+    return fig_torri
+
+
+@figure_builder("tenancy", columns=['Anno', 'Tenancy Ratio'])
+def build_tenancy(df, obiettivo=None, anno=None):
+    import plotly.express as px
+
+    fig_tenancy = px.line(
+        df,
+        x='Anno',
+        y='Tenancy Ratio',
+        title="Tenancy Ratio (Operatori per Torre)",
+        markers=True,
+        text='Tenancy Ratio',
+        template=TEMPLATE,
+    )
+    fig_tenancy.update_traces(texttemplate='%{text:.1f}x')
+    if obiettivo is not None:
+        fig_tenancy.add_hline(y=obiettivo, line_dash="dash", line_color="green",
+                              annotation_text=f"Obiettivo {anno}" if anno else "Obiettivo")
+    return fig_tenancy
+
+
+@figure_builder("arpu", columns=['Anno', 'Ricavi per Torre (€K)'])
+def build_arpu(df):
+    import plotly.express as px
+
+    fig_arpu = px.bar(
+        df,
+        x='Anno',
+        y='Ricavi per Torre (€K)',
+        title="ARPU per Torre (€K annui)",
+        text='Ricavi per Torre (€K)',
+        color='Ricavi per Torre (€K)',
+        color_continuous_scale='Greens',
+        template=TEMPLATE,
+    )
+    fig_arpu.update_traces(texttemplate='€%{text}K')
+    return fig_arpu
+
+
+@figure_builder("fcf", columns=['Anno', 'FCF (€M)', 'Dividendi Totali (€M)', 'Copertura FCF'])
+def build_fcf(df):
+    fig_fcf = go.Figure()
+    fig_fcf.add_trace(go.Bar(
+        x=df['Anno'],
+        y=df['FCF (€M)'],
+        name='Free Cash Flow',
+        marker_color='blue',
+    ))
+    fig_fcf.add_trace(go.Bar(
+        x=df['Anno'],
+        y=df['Dividendi Totali (€M)'],
+        name='Dividendi Pagati',
+        marker_color='green',
+    ))
+    fig_fcf.add_trace(go.Scatter(
+        x=df['Anno'],
+        y=df['Copertura FCF'] * 100,
+        mode='lines+markers+text',
+        name='Copertura FCF (x)',
+        yaxis='y2',
+        line=dict(color='red'),
+        text=df['Copertura FCF'].round(1)
+    ))
+
+    fig_fcf.update_layout(
+        title="Free Cash Flow vs Dividendi Distribuiti",
+        barmode='group',
+        xaxis_title="Anno",
+        yaxis_title="Milioni €",
+        yaxis2=dict(
+            title="Copertura FCF (volte)",
+            overlaying="y",
+            side="right",
+            range=[0, 6]
+        )
+    )
+    return fig_fcf
+
+
+@figure_builder("coverage_mc")
+def build_coverage_mc(df, anno=None):
+    fig_mc = go.Figure(go.Bar(
+        x=df['Copertura'],
+        y=df['Frequenza (%)'],
+        marker_color=['crimson' if c < 1 else 'seagreen' for c in df['Copertura']],
+        name='Percorsi simulati',
+    ))
+    fig_mc.add_vline(x=1, line_dash="dash", line_color="orange", annotation_text="Copertura 1.0x")
+    fig_mc.update_layout(
+        title=f"Distribuzione simulata della Copertura FCF {anno}" if anno else "Distribuzione simulata della Copertura FCF",
+        xaxis_title="Copertura FCF (volte)",
+        yaxis_title="% dei percorsi",
+        bargap=0,
+        showlegend=False,
+    )
+    return fig_mc
+
+
+@figure_builder("payout", columns=['Anno', 'Payout Ratio EPS (%)'])
+def build_payout(df, payout_fcf=None):
+    import plotly.express as px
+
+    fig_payout = px.line(
+        df,
+        x='Anno',
+        y='Payout Ratio EPS (%)',
+        title="Payout Ratio su EPS (%)",
+        markers=True,
+        text='Payout Ratio EPS (%)',
+        template=TEMPLATE,
+    )
+
+    fig_payout.update_traces(texttemplate='%{text:.0f}%')
+    if payout_fcf is not None:
+        fig_payout.add_hline(y=payout_fcf * 100, line_dash="dash", line_color="orange",
+                             annotation_text=f"Target: ~{payout_fcf:.0%} FCF")
+    fig_payout.update_layout(yaxis=dict(range=[0, 200]))
+    return fig_payout
+
+
+@figure_builder("proj", columns=['Anno', 'DPS (€)', 'Tipo'])
+def build_proj(df, crescita=0.075):
+    # Costruito con graph_objects (stesso aspetto di px.line con color='Tipo'):
+    # cambia a ogni variazione dello scenario what-if, e px costa ~10 volte di più
+    colori = {'Storico': 'blue', 'Confermato': 'green', 'Piano': 'orange'}
+    fig_proj = go.Figure()
+    for tipo in df['Tipo'].unique():
+        serie = df[df['Tipo'] == tipo]
+        fig_proj.add_trace(go.Scatter(
+            x=serie['Anno'],
+            y=serie['DPS (€)'],
+            text=serie['DPS (€)'],
+            name=tipo,
+            legendgroup=tipo,
+            mode='lines+text+markers',
+            line=dict(color=colori.get(tipo), dash='solid'),
+            marker=dict(symbol='circle'),
+            hovertemplate=f"Tipo={tipo}<br>Anno=%{{x}}<br>DPS (€)=%{{text}}<extra></extra>",
+            showlegend=True
+        ))
+    fig_proj.update_layout(
+        title=f"Dividendo per Azione: Storico e Proiezioni ({df['Anno'].min()}-{df['Anno'].max()})",
+        legend=dict(title="Tipo", tracegroupgap=0)
+    )
+
+    fig_proj.update_traces(texttemplate='€%{text:.3f}')
+
+    # Aggiungi area evidenziata per periodo piano industriale (anni non storici)
+    piano = df.loc[df['Tipo'] != 'Storico', 'Anno']
+    if not piano.empty:
+        fig_proj.add_vrect(
+            x0=piano.min() - 0.5, x1=piano.max() + 0.5,
+            fillcolor="lightgreen", opacity=0.2,
+            line_width=0
+        )
+
+        fig_proj.add_annotation(
+            x=(piano.min() + piano.max()) / 2, y=round(df['DPS (€)'].max() * 0.97, 2),
+            text=f"Piano Industriale<br>{crescita:+.1%} annuo",
+            showarrow=True,
+            arrowcolor="green",
+            font=dict(size=12),
+            ax=0, ay=-40
+        )
+
+    fig_proj.update_layout(
+        xaxis_title="Anno",
+        yaxis_title="Dividendo per Azione (€)"
+    )
+    return fig_proj
+
+
+@figure_builder("yield_grid", decimals=2)
+def build_yield_grid(df, anno, prezzo_rif=None, crescita_rif=None, forward=False):
+    metrica = "Yield forward" if forward else "Yield on cost"
+    fig_grid = go.Figure(go.Heatmap(
+        z=df.values,
+        x=df.columns,
+        y=df.index,
+        colorscale='RdYlGn',
+        colorbar=dict(title="Yield (%)"),
+        hovertemplate="Prezzo €%{x:.2f}<br>Crescita DPS %{y:.2f}%<br>" + metrica + " %{z:.2f}%<extra></extra>",
+    ))
+    fig_grid.add_trace(go.Contour(
+        z=df.values,
+        x=df.columns,
+        y=df.index,
+        contours=dict(coloring='none', showlabels=True, start=3, end=10, size=1),
+        line=dict(color='black', width=1),
+        hoverinfo='skip',
+        showscale=False,
+    ))
+    if prezzo_rif is not None and crescita_rif is not None:
+        fig_grid.add_trace(go.Scatter(
+            x=[prezzo_rif], y=[crescita_rif * 100],
+            mode='markers',
+            marker=dict(symbol='x', size=12, color='black'),
+            name='Prezzo attuale / crescita piano',
+        ))
+    fig_grid.update_layout(
+        title=f"{metrica} {anno} per prezzo di ingresso e crescita DPS",
+        xaxis_title="Prezzo di ingresso (€)",
+        yaxis_title="Crescita annua DPS (%)",
+        showlegend=False,
+    )
+    return fig_grid
+
+
+@figure_builder("ddm_surface", decimals=2)
+def build_ddm_surface(df, g1, prezzo=None, ke_rif=None, g2_rif=None):
+    fig_ddm = go.Figure(go.Heatmap(
+        z=df.values,
+        x=df.columns,
+        y=df.index,
+        colorscale='RdYlGn',
+        zmin=max(float(np.nanmin(df.values)), 0.0),
+        zmax=float(np.nanpercentile(df.values, 95)),
+        colorbar=dict(title="Valore (€)"),
+        hovertemplate="Crescita terminale %{x:.1f}%<br>Costo del capitale %{y:.1f}%<br>"
+                      "Valore €%{z:.2f}<extra></extra>",
+    ))
+    if prezzo is not None:
+        # Curva delle combinazioni che giustificano il prezzo corrente
+        fig_ddm.add_trace(go.Contour(
+            z=df.values,
+            x=df.columns,
+            y=df.index,
+            contours=dict(coloring='none', showlabels=True, start=prezzo, end=prezzo, size=1),
+            line=dict(color='black', width=2, dash='dash'),
+            hoverinfo='skip',
+            showscale=False,
+        ))
+    if ke_rif is not None and g2_rif is not None:
+        fig_ddm.add_trace(go.Scatter(
+            x=[g2_rif * 100], y=[ke_rif * 100],
+            mode='markers',
+            marker=dict(symbol='x', size=12, color='black'),
+            name='Ipotesi selezionate',
+        ))
+    fig_ddm.update_layout(
+        title=f"Valore DDM per costo del capitale e crescita terminale (crescita esplicita {g1:.2%})",
+        xaxis_title="Crescita terminale del DPS (%)",
+        yaxis_title="Costo del capitale proprio (%)",
+        showlegend=False,
+    )
+    return fig_ddm
+
+
+@figure_builder("ddm_implied")
+def build_ddm_implied(df, prezzo):
+    fig_implied = go.Figure()
+    for column in df.columns:
+        fig_implied.add_trace(go.Scatter(
+            x=df.index,
+            y=df[column],
+            mode='lines',
+            name=column.replace("g1", "Crescita esplicita"),
+            hovertemplate="Costo del capitale %{x:.1f}%<br>Crescita implicita %{y:.2f}%<extra></extra>",
+        ))
+    fig_implied.update_layout(
+        title=f"Crescita terminale implicita nel prezzo di €{prezzo:.2f}",
+        xaxis_title="Costo del capitale proprio (%)",
+        yaxis_title="Crescita terminale implicita (%)",
+    )
+    return fig_implied
+
+
+@figure_builder("leverage", columns=['Anno', 'ND/EBITDA', 'Target ND/EBITDA'])
+def build_leverage(df, eventi=()):
+    fig_leverage = go.Figure()
+
+    fig_leverage.add_trace(go.Scatter(
+        x=df['Anno'],
+        y=df['ND/EBITDA'],
+        mode='lines+markers',
+        name='ND/EBITDA Effettivo',
+        line=dict(color='red', width=3),
+        marker=dict(size=10)
+    ))
+
+    fig_leverage.add_trace(go.Scatter(
+        x=df['Anno'],
+        y=df['Target ND/EBITDA'],
+        mode='lines+markers',
+        name='Target ND/EBITDA',
+        line=dict(color='green', width=2, dash='dash')
+    ))
+
+    fig_leverage.update_layout(
+        title="Evoluzione Leverage: Net Debt/EBITDA",
+        xaxis_title="Anno",
+        yaxis_title="Net Debt/EBITDA (x)",
+        yaxis=dict(range=[0, 5.5])
+    )
+
+    for anno, testo in eventi:
+        row = df[_year_rows(df['Anno'], anno)]
+        if row.empty:
+            continue
+        fig_leverage.add_annotation(
+            x=row['Anno'].iloc[0], y=float(row['ND/EBITDA'].iloc[0]),
+            text=_event_label(f"Post-{testo}"),
+            showarrow=True,
+            ax=20, ay=-30
+        )
+    return fig_leverage
+
+
+@figure_builder("coverage", columns=['Anno', 'Interest Cover'])
+def build_coverage(df):
+    import plotly.express as px
+
+    fig_coverage = px.bar(
+        df,
+        x='Anno',
+        y='Interest Cover',
+        title="Interest Coverage (EBITDA/Interessi)",
+        text='Interest Cover',
+        color='Interest Cover',
+        color_continuous_scale='RdYlGn',
+        template=TEMPLATE,
+    )
+
+    fig_coverage.update_traces(texttemplate='%{text:.1f}x')
+    fig_coverage.add_hline(y=4, line_dash="dash", line_color="orange", annotation_text="Soglia Prudenziale")
+    return fig_coverage
+
+
+@figure_builder("debt_interest")
+def build_debt_interest(df, shift, altri_oneri):
+    fig_interest = go.Figure()
+    for column in [c for c in df.columns if c.startswith("Interessi ")]:
+        fig_interest.add_trace(go.Bar(
+            x=df['Anno'],
+            y=df[column],
+            name=column[len("Interessi "):].replace(" (€M)", ""),
+            hovertemplate="%{x}: €%{y:.1f}M<extra></extra>",
+        ))
+    fig_interest.add_trace(go.Bar(
+        x=df['Anno'],
+        y=[altri_oneri] * len(df),
+        name='Leasing e altri oneri',
+        marker_color='lightgrey',
+        hovertemplate="%{x}: €%{y:.1f}M<extra></extra>",
+    ))
+    fig_interest.update_layout(
+        barmode='stack',
+        title=f"Oneri finanziari per strumento (EURIBOR {shift:+.0f} bps)",
+        xaxis_title="Anno",
+        yaxis_title="Oneri finanziari (€M)",
+    )
+    return fig_interest
+
+
+@figure_builder("debt_scenarios")
+def build_debt_scenarios(df, metrica, shift, soglia=None):
+    # Una linea per scenario, in un'unica traccia separata da interruzioni (una
+    # traccia per scenario costerebbe ~1 ms ciascuna); in evidenza lo scenario
+    # selezionato e la curva senza spostamento
+    others = [column for column in df.columns if column not in (0, shift)]
+    gap = [np.nan]
+    fig_scenarios = go.Figure(go.Scatter(
+        x=np.concatenate([np.append(df.index.to_numpy(dtype=float), gap) for _ in others]) if others else [],
+        y=np.concatenate([np.append(df[column].to_numpy(dtype=float), gap) for column in others]) if others else [],
+        customdata=np.repeat(others, len(df) + 1),
+        mode='lines',
+        line=dict(color='rgba(128,128,128,0.35)', width=1),
+        hovertemplate="%{customdata:+.0f} bps<br>%{x}: %{y:.2f}<extra></extra>",
+        showlegend=False,
+    ))
+    for column, name, line in ((0, 'Curva di riferimento', dict(color='blue', width=2, dash='dash')),
+                               (shift, f'Scenario {shift:+.0f} bps', dict(color='red', width=3))):
+        if column in df.columns:
+            fig_scenarios.add_trace(go.Scatter(
+                x=df.index,
+                y=df[column],
+                mode='lines+markers',
+                name=name,
+                line=line,
+                hovertemplate=f"{column:+.0f} bps<br>%{{x}}: %{{y:.2f}}<extra></extra>",
+            ))
+    if soglia is not None:
+        fig_scenarios.add_hline(y=soglia, line_dash="dot", line_color="orange")
+    fig_scenarios.update_layout(
+        title=f"{metrica} per scenario di tasso ({df.columns.min():+.0f}/{df.columns.max():+.0f} bps)",
+        xaxis_title="Anno",
+        yaxis_title=metrica,
+    )
+    return fig_scenarios
+
+
+@figure_builder("yield_comp", columns=['Società', 'Dividend Yield 2024E (%)', 'Nota'])
+def build_yield_comp(df):
+    # graph_objects invece di px.bar (stesso aspetto): il grafico cambia con lo scenario what-if
+    yields = df['Dividend Yield 2024E (%)']
+    fig_yield_comp = go.Figure(go.Bar(
+        x=df['Società'],
+        y=yields,
+        text=yields,
+        texttemplate='%{text:.1f}%',
+        customdata=df[['Nota']].to_numpy(),
+        marker=dict(color=yields, coloraxis='coloraxis'),
+        hovertemplate="Società=%{x}<br>Dividend Yield 2024E (%)=%{marker.color}<br>"
+                      "Nota=%{customdata[0]}<extra></extra>",
+        name='',
+        showlegend=False
+    ))
+    fig_yield_comp.update_layout(
+        title="Confronto Dividend Yield con Peers (2024E)",
+        coloraxis=dict(colorscale='Viridis', colorbar=dict(title='Dividend Yield 2024E (%)')),
+        barmode='relative',
+        xaxis_title="",
+        yaxis_title="Dividend Yield (%)"
+    )
+    return fig_yield_comp
+
+
+@figure_builder("risk_return", columns=['Asset', 'Dividend Yield (%)', 'Rendimento Atteso (%)', 'Volatilità (%)'])
+def build_risk_return(df, nome):
+    import plotly.express as px
+
+    fig_risk_return = px.scatter(
+        df,
+        x='Volatilità (%)',
+        y='Rendimento Atteso (%)',
+        size='Dividend Yield (%)',
+        text='Asset',
+        title=f"Profilo Rischio-Rendimento: {nome} vs Alternative",
+        labels={'Volatilità (%)': 'Volatilità Annua (%)', 'Rendimento Atteso (%)': 'TSR Atteso Annuo (%)'},
+        template=TEMPLATE,
+    )
+
+    fig_risk_return.update_layout(
+        xaxis=dict(range=[0, 35]),
+        yaxis=dict(range=[2, 10])
+    )
+    return fig_risk_return
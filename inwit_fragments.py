@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Rerun parziali dei pannelli interattivi (``st.fragment``).
+
+Un pannello decorato con ``@fragment`` (controlli più grafici e metriche
+che ne dipendono) quando si modifica uno dei suoi controlli viene
+rieseguito da solo: header, CSS, disclaimer e il resto della sezione non
+vengono ricalcolati né reinviati al browser. Richiede Streamlit ≥ 1.37
+(``requirements.txt``); con versioni precedenti ``fragment`` lascia la
+funzione invariata e ogni interazione riesegue tutto lo script.
+
+Streamlit conserva, per ogni frammento, la funzione e gli argomenti della
+prima chiamata della sessione e li riusa nei rerun parziali: dopo un cambio
+di titolo o di scenario what-if il pannello verrebbe ricalcolato con i dati
+vecchi. ``fragment`` registra invece nella sessione l'ultima chiamata di
+ogni frammento (funzione e argomenti dell'ultimo rerun completo, o del
+frammento esterno che lo contiene) e il rerun parziale esegue quella. Per
+lo stesso motivo un frammento può essere definito dentro un'altra funzione
+(e catturarne le variabili) ed essere chiamato da un altro frammento.
+
+Vincoli:
+
+- un frammento scrive solo nel proprio container (per la sidebar si usa
+  ``with st.sidebar:`` attorno alla chiamata, non ``st.sidebar.*`` dentro);
+- i valori dei suoi widget non vanno usati fuori dal frammento, che al
+  rerun parziale non verrebbe aggiornato.
+
+I rerun parziali non compaiono nel pannello di debug dei tempi
+(``inwit_profiling``), che misura i rerun completi.
+"""
+import functools
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+_native = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+FRAGMENTS_AVAILABLE = _native is not None
+
+# Chiave di session_state con l'ultima chiamata di ogni frammento: id -> (funzione, args, kwargs)
+_CALLS_KEY = "_fragment_calls"
+
+# Chiamata in corso dal codice della pagina (per thread: ogni sessione esegue lo script nel proprio)
+_pending = threading.local()
+
+
+def fragment(func):
+    """Decoratore: ``st.fragment`` se disponibile, altrimenti la funzione stessa."""
+    if _native is None:
+        return func
+
+    @_native
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        ctx = get_script_run_ctx()
+        fragment_id = getattr(ctx, "current_fragment_id", None)
+        calls = st.session_state.setdefault(_CALLS_KEY, {})
+        call, _pending.call = getattr(_pending, "call", None), None
+        if call is not None and fragment_id is not None:
+            calls[fragment_id] = call
+        # Rerun parziale: Streamlit passa la chiamata memorizzata alla prima esecuzione
+        target, args, kwargs = calls.get(fragment_id, (func, args, kwargs))
+        return target(*args, **kwargs)
+
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        _pending.call = (func, args, kwargs)
+        return run(*args, **kwargs)
+
+    return call
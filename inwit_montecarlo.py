@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Simulazione Monte Carlo della copertura FCF del dividendo.
+
+Genera in blocco (array NumPy ``percorsi x anni``, senza cicli Python sui
+percorsi) traiettorie congiunte di Free Cash Flow, numero di azioni e
+crescita del DPS a partire dallo storico di ``fcf_analysis`` e dalla
+politica di crescita del dividendo del titolo. Per ogni anno simulato la
+copertura è ``FCF / (DPS x Azioni)``, come la colonna ``Copertura FCF``.
+
+I parametri di default sono stimati sullo storico con stimatori robusti
+(mediana e MAD delle variazioni logaritmiche), così un anno anomalo come
+il 2021 non domina la volatilità. Il risultato è in cache per processo:
+100.000 percorsi su 2-3 anni richiedono poche decine di millisecondi.
+Anche le statistiche ricavate dai percorsi (probabilità, percentili,
+istogramma) sono calcolate una volta sola e condivise tra le sessioni con
+la simulazione, invece di ripercorrere l'array dei percorsi a ogni rerun.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from inwit_profiling import span
+
+DEFAULT_PATHS = 100_000
+DEFAULT_SEED = 20240101
+
+# Fattore che rende la MAD uno stimatore consistente della deviazione standard
+_MAD_TO_SIGMA = 1.4826
+
+
+@dataclass(frozen=True)
+class CoverageParams:
+    base_year: int
+    years: int             # anni simulati dopo base_year
+    fcf_base: float        # €M
+    fcf_drift: float       # crescita log annua attesa del FCF
+    fcf_vol: float         # volatilità log annua del FCF
+    shares_base: float     # milioni di azioni
+    shares_drift: float
+    shares_vol: float
+    dps_base: float        # €
+    dps_growth: float      # crescita annua programmata del DPS
+    dps_growth_vol: float  # scostamento annuo dalla crescita programmata
+    fcf_dps_corr: float    # correlazione tra shock del FCF e della crescita DPS
+
+
+@dataclass(frozen=True)
+class CoverageSimulation:
+    params: CoverageParams
+    coverage: np.ndarray  # (percorsi, anni), float32
+    # Statistiche già calcolate, per argomenti: da non modificare (condivise)
+    _derived: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def _memo(self, key, compute):
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = compute()
+            return value
+
+    @property
+    def year_labels(self):
+        return [self.params.base_year + i + 1 for i in range(self.params.years)]
+
+    def prob_below(self, threshold=1.0):
+        """Probabilità, per anno, che la copertura sia inferiore a ``threshold``."""
+        def compute():
+            prob = (self.coverage < threshold).mean(axis=0)
+            prob.flags.writeable = False
+            return prob
+        return self._memo(("prob_below", threshold), compute)
+
+    def summary(self, threshold=1.0):
+        """Percentili e probabilità di copertura insufficiente per anno."""
+        def compute():
+            q = np.percentile(self.coverage, [5, 25, 50, 75, 95], axis=0)
+            return pd.DataFrame({
+                "Anno": self.year_labels,
+                "P5": q[0], "P25": q[1], "Mediana": q[2], "P75": q[3], "P95": q[4],
+                f"P(Copertura < {threshold:.1f}x)": self.prob_below(threshold),
+            })
+        return self._memo(("summary", threshold), compute)
+
+    def histogram(self, year_index=-1, bins=80, clip=(0.0, 3.0)):
+        """Istogramma della copertura di un anno, come DataFrame da passare a un grafico."""
+        def compute():
+            values = np.clip(self.coverage[:, year_index], *clip)
+            counts, edges = np.histogram(values, bins=bins, range=clip)
+            return pd.DataFrame({
+                "Copertura": (edges[:-1] + edges[1:]) / 2,
+                "Frequenza (%)": counts / len(values) * 100,
+            })
+        return self._memo(("histogram", year_index, bins, tuple(clip)), compute)
+
+
+def _robust_log_changes(values):
+    changes = np.diff(np.log(np.asarray(values, dtype=float)))
+    median = float(np.median(changes))
+    mad = float(np.median(np.abs(changes - median)))
+    return median, _MAD_TO_SIGMA * mad
+
+
+def calibrate(df_fcf, company, dps_growth_vol=0.02, fcf_dps_corr=0.3):
+    """Parametri di default stimati sullo storico ``fcf_analysis`` e sulla politica del titolo.
+
+    DPS e crescita sono quelli dello scenario what-if della scheda ``company``:
+    il DPS dell'anno base varia come l'ultimo DPS pagato rispetto al caso base.
+    """
+    last = df_fcf.iloc[-1]
+    dps_base = float(last["DPS (€)"])
+    base = company.get("scenario_base")
+    if base is not None and base.dps:
+        dps_base *= float(company["ultimo_dps"]) / base.dps
+    fcf_drift, fcf_vol = _robust_log_changes(df_fcf["FCF (€M)"])
+    shares_drift, shares_vol = _robust_log_changes(df_fcf["Azioni (M)"])
+    base_year = int(last["Anno"])
+    return CoverageParams(
+        base_year=base_year,
+        years=max(int(company["anno_fine_piano"]) - base_year, 1),
+        fcf_base=float(last["FCF (€M)"]),
+        fcf_drift=fcf_drift,
+        fcf_vol=fcf_vol,
+        shares_base=float(last["Azioni (M)"]),
+        shares_drift=shares_drift,
+        shares_vol=shares_vol,
+        dps_base=dps_base,
+        dps_growth=float(company["crescita_dps"]),
+        dps_growth_vol=dps_growth_vol,
+        fcf_dps_corr=fcf_dps_corr,
+    )
+
+
+def simulate_coverage(params, paths=DEFAULT_PATHS, seed=DEFAULT_SEED):
+    """Copertura FCF simulata su ``paths`` percorsi (senza cache)."""
+    rng = np.random.default_rng(seed)
+    shape = (paths, params.years)
+
+    # Shock congiunti: FCF e crescita DPS correlati, azioni indipendenti
+    z_fcf = rng.standard_normal(shape)
+    z_dps = rng.standard_normal(shape)
+    rho = params.fcf_dps_corr
+    z_dps = rho * z_fcf + np.sqrt(1.0 - rho * rho) * z_dps
+    z_shares = rng.standard_normal(shape)
+
+    # FCF come shock indipendenti sul livello dell'anno base (il FCF di un
+    # anno non si trascina sul successivo, come si vede nel 2021)
+    horizon = np.arange(1, params.years + 1)
+    fcf = params.fcf_base * np.exp(params.fcf_drift * horizon + params.fcf_vol * z_fcf)
+    shares = params.shares_base * np.exp(
+        np.cumsum(params.shares_drift + params.shares_vol * z_shares, axis=1)
+    )
+    dps = params.dps_base * np.cumprod(
+        1.0 + params.dps_growth + params.dps_growth_vol * z_dps, axis=1
+    )
+    return CoverageSimulation(params, (fcf / (dps * shares)).astype(np.float32))
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _simulate_cached(params, paths, seed):
+    # I risultati sono condivisi tra sessioni: gli array sono in sola lettura.
+    simulation = simulate_coverage(params, paths, seed)
+    simulation.coverage.flags.writeable = False
+    return simulation
+
+
+def run_coverage_simulation(params, paths=DEFAULT_PATHS, seed=DEFAULT_SEED):
+    """Come ``simulate_coverage``, dalla cache se parametri e numero di percorsi sono invariati."""
+    with span("compute", "montecarlo"):
+        return _simulate_cached(params, int(paths), int(seed))
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""Strumentazione opzionale dei tempi di un rerun.
+
+Disattivata di default. Si attiva per tutte le sessioni con la variabile
+d'ambiente ``INWIT_PROFILE=1``. Se l'ambiente imposta anche
+``INWIT_PROFILE_ALLOW_URL=1`` si può attivare per una sola sessione aprendo
+l'app con ``?debug=1`` nell'URL; senza questa variabile il parametro viene
+ignorato, così un visitatore qualsiasi non può strumentare il processo né
+scrivere su disco. Quando è attiva registra la durata di:
+
+- ``setup``: import, registro e header comuni a tutte le sezioni;
+- ``import`` / ``data`` / ``section``: import del modulo, caricamento delle
+  tabelle e rendering di ciascuna sezione;
+- ``figure`` / ``figure_build``: recupero di un grafico dal registro e, se
+  non in cache, sua costruzione;
+- ``st.plotly_chart``, ``st.dataframe``, ``st.markdown``: ogni chiamata,
+  serializzazione verso il browser compresa (``st.markdown[html]`` per i
+  blocchi con ``unsafe_allow_html``).
+
+I tempi compaiono in un pannello "Debug" nella sidebar. Con
+``INWIT_PROFILE=1`` vengono anche accodati come JSON lines (un record per
+misura più uno di riepilogo per rerun) nel file indicato da
+``INWIT_PROFILE_LOG`` (default ``profile.jsonl`` nella cartella dell'app);
+le sessioni attivate dall'URL li mostrano soltanto. A strumentazione spenta ``span()`` non misura nulla e
+le funzioni di Streamlit non vengono toccate.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+PROFILE_ENV = "INWIT_PROFILE"
+PROFILE_LOG_ENV = "INWIT_PROFILE_LOG"
+ALLOW_URL_ENV = "INWIT_PROFILE_ALLOW_URL"
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profile.jsonl")
+QUERY_PARAM = "debug"
+
+# Chiamate Streamlit misurate quando la strumentazione è attiva
+INSTRUMENTED_ELEMENTS = ["plotly_chart", "dataframe", "markdown"]
+
+_STATE_KEY = "_inwit_profile"
+_log_lock = threading.Lock()
+_install_lock = threading.Lock()
+_installed = False
+
+
+class RerunProfile:
+    """Misure di un singolo rerun di una sessione."""
+
+    def __init__(self, session, rerun, log=False):
+        self.session = session
+        self.rerun = rerun
+        self.log = log  # accoda le misure al file di log
+        self.spans = []
+        self.active = True
+        self.start = self.checkpoint_at = time.perf_counter()
+        self._depth = 0
+        self._checkpoint_index = 0
+
+    @contextmanager
+    def span(self, stage, name=""):
+        record = {"stage": stage, "name": name, "depth": self._depth,
+                  "offset_ms": (time.perf_counter() - self.start) * 1000}
+        self.spans.append(record)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = (time.perf_counter() - start) * 1000
+            self._depth -= 1
+
+    def checkpoint(self, stage, name=""):
+        # Le misure registrate dal checkpoint precedente diventano figlie di questo
+        now = time.perf_counter()
+        children = self.spans[self._checkpoint_index:]
+        for record in children:
+            record["depth"] += 1
+        self.spans.insert(self._checkpoint_index, {
+            "stage": stage, "name": name, "depth": self._depth,
+            "offset_ms": (self.checkpoint_at - self.start) * 1000,
+            "ms": (now - self.checkpoint_at) * 1000,
+        })
+        self.checkpoint_at = now
+        self._checkpoint_index = len(self.spans)
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+
+def _enabled(name):
+    return os.environ.get(name, "") not in ("", "0")
+
+
+def _requested():
+    """``"log"`` se attiva per il processo, ``"screen"`` se richiesta dall'URL (e ammessa), altrimenti None."""
+    if _enabled(PROFILE_ENV):
+        return "log"
+    if _enabled(ALLOW_URL_ENV) and st.query_params.get(QUERY_PARAM) == "1":
+        return "screen"
+    return None
+
+
+def _current():
+    profile = st.session_state.get(_STATE_KEY)
+    return profile if profile is not None and profile.active else None
+
+
+def span(stage, name=""):
+    """Context manager che misura un blocco; non fa nulla a strumentazione spenta."""
+    profile = _current()
+    return profile.span(stage, name) if profile is not None else nullcontext()
+
+
+def checkpoint(stage, name=""):
+    """Registra il tempo trascorso dall'inizio del rerun (o dal checkpoint precedente)."""
+    profile = _current()
+    if profile is not None:
+        profile.checkpoint(stage, name)
+
+
+def _timed_element(element, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        profile = _current()
+        if profile is None:
+            return method(*args, **kwargs)
+        name = ""
+        if element == "markdown":
+            body = kwargs.get("body", args[1] if len(args) > 1 else "")
+            name = f"{len(str(body))} caratteri"
+            html = kwargs.get("unsafe_allow_html", len(args) > 2 and args[2])
+            element_name = "st.markdown[html]" if html else "st.markdown"
+        else:
+            element_name = f"st.{element}"
+        with profile.span(element_name, name):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _install():
+    """Avvolge le chiamate Streamlit misurate (una volta per processo)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        for element in INSTRUMENTED_ELEMENTS:
+            # Metodi dei container (colonne, sidebar, expander)...
+            setattr(DeltaGenerator, element, _timed_element(element, getattr(DeltaGenerator, element)))
+            # ...e le funzioni ``st.*``, già legate al container principale
+            bound = getattr(st, element)
+            setattr(st, element, functools.partial(getattr(DeltaGenerator, element), bound.__self__))
+        _installed = True
+
+
+def start_rerun():
+    """Da chiamare all'inizio dello script: attiva la misura del rerun se richiesta."""
+    previous = st.session_state.get(_STATE_KEY)
+    mode = _requested()
+    if mode is None:
+        if previous is not None:
+            del st.session_state[_STATE_KEY]
+        return None
+    _install()
+    session = previous.session if previous is not None else uuid.uuid4().hex[:12]
+    rerun = previous.rerun + 1 if previous is not None else 1
+    profile = RerunProfile(session, rerun, log=mode == "log")
+    st.session_state[_STATE_KEY] = profile
+    return profile
+
+
+def _write_log(profile, context, total_ms):
+    common = {"ts": time.time(), "session": profile.session, "rerun": profile.rerun, **context}
+    lines = [json.dumps({**common, "type": "span", **record}, ensure_ascii=False)
+             for record in profile.spans]
+    lines.append(json.dumps({**common, "type": "rerun", "ms": total_ms}, ensure_ascii=False))
+    with _log_lock, open(os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG), "a", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def finish_rerun(**context):
+    """Chiude la misura del rerun: scrive il log (se previsto) e mostra il pannello di debug."""
+    profile = _current()
+    if profile is None:
+        return
+    total_ms = profile.total_ms
+    profile.active = False  # il pannello stesso non viene misurato
+    if profile.log:
+        _write_log(profile, context, total_ms)
+
+    import pandas as pd
+
+    with st.sidebar.expander("🛠️ Debug: tempi del rerun", expanded=False):
+        st.caption(f"Rerun {profile.rerun} · totale {total_ms:.1f} ms")
+        spans = pd.DataFrame(profile.spans, columns=["stage", "name", "depth", "offset_ms", "ms"])
+        by_stage = (spans[spans["depth"] == 0].groupby("stage", sort=False)["ms"].sum()
+                    .sort_values(ascending=False).reset_index())
+        st.dataframe(by_stage, hide_index=True, use_container_width=True,
+                     column_config={"ms": st.column_config.NumberColumn("ms", format="%.1f")})
+        spans["stage"] = ["· " * depth + stage for depth, stage in zip(spans["depth"], spans["stage"])]
+        st.dataframe(spans.drop(columns="depth"), hide_index=True, use_container_width=True,
+                     column_config={"offset_ms": st.column_config.NumberColumn("inizio ms", format="%.1f"),
+                                    "ms": st.column_config.NumberColumn("ms", format="%.1f")})
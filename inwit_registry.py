@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Registro dei titoli analizzabili dalla dashboard (``data/registry.json``).
+
+Il registro contiene solo i dati anagrafici e di politica dei dividendi di
+ciascun titolo; le tabelle numeriche stanno nel bundle ``data/<ticker>/`` e
+vengono caricate (e messe in cache) solo quando il titolo viene selezionato,
+quindi aggiungere titoli al registro non rallenta l'avvio.
+
+Campi facoltativi, mostrati solo per i titoli che li hanno: ``nota_cagr``
+(nota sul CAGR dei dividendi), ``obiettivi`` di piano (``ebitda_margin``,
+``tenancy_ratio``), ``covenant_nd_ebitda`` e ``valutazione``
+(``tsr_atteso``, ``fair_value``) dal report di analisi. I commenti testuali
+delle sezioni stanno nel bundle (``inwit_commentary``).
+"""
+import json
+import os
+
+import streamlit as st
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Stessa cartella di inwit_data.DATA_DIR, senza importare pandas e pyarrow
+# prima che l'header sia disegnato
+REGISTRY_PATH = os.path.join(ROOT_DIR, "data", "registry.json")
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_registry_cached(path, mtime_ns):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def load_registry(path=REGISTRY_PATH):
+    return _load_registry_cached(path, os.stat(path).st_mtime_ns)
+
+
+def tickers():
+    """Ticker disponibili, nell'ordine del registro."""
+    return list(load_registry()["tickers"])
+
+
+def ticker_labels():
+    """Etichette per il menu di selezione: ``"INWIT (INWIT.MI)" -> "INWIT.MI"``."""
+    return {
+        f"{info['nome_breve']} ({ticker})": ticker
+        for ticker, info in load_registry()["tickers"].items()
+    }
+
+
+def default_ticker():
+    return load_registry()["default"]
+
+
+def company_info(ticker):
+    """Scheda del titolo ``ticker``, con il ticker stesso e il percorso del report."""
+    info = dict(load_registry()["tickers"][ticker], ticker=ticker)
+    if info.get("analisi"):
+        info["analisi"] = os.path.join(ROOT_DIR, info["analisi"])
+    return info
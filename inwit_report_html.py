@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Pre-rendering HTML del report di analisi, con cache per hash del contenuto.
+
+Uso:  python inwit_report_html.py [--report PERCORSO ...] [--out DIR] [--no-prune]
+
+Il report è testo con un paragrafo per riga e punti elenco ``•``. Ogni
+sezione numerata (e l'Executive Summary) viene convertita una volta sola in
+HTML sanificato:
+
+- una riga è un paragrafo ``<p>``, righe ``•``/``-`` consecutive un ``<ul>``;
+- la formattazione in linea (grassetto, corsivo, link) è quella Markdown di
+  ``markdown-it``, con l'HTML grezzo disabilitato: ``<``, ``>`` e ``&`` del
+  testo vengono sempre escapati e i link ``javascript:`` scartati;
+- il titolo della sezione è un ``<div class="section-title">``.
+
+Ogni frammento è salvato in ``data/report_html/<hash>.html``, dove l'hash è
+calcolato sul testo della sezione (e sulla versione del convertitore): se
+una sezione cambia, alla build successiva viene riconvertita solo quella.
+Con il file presente l'app legge e serve il frammento, senza convertirlo; se
+manca (build non eseguita dopo una modifica) lo converte in memoria, una
+volta per processo. I blocchi (paragrafi ed elenchi) sono su righe separate
+del file, così le sezioni lunghe si dividono in pagine senza riconvertirle.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from dataclasses import dataclass
+
+import streamlit as st
+from markdown_it import MarkdownIt
+
+from inwit_analysis import parse_analysis
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HTML_DIR = os.path.join(ROOT, "data", "report_html")
+REGISTRY_PATH = os.path.join(ROOT, "data", "registry.json")
+
+# Da incrementare quando cambia l'HTML prodotto, per invalidare i frammenti salvati
+RENDERER_VERSION = "1"
+
+_INLINE = MarkdownIt("commonmark", {"html": False})
+_BULLET_RE = re.compile(r"^\s*[•\-*]\s+")
+
+# Lunghezza indicativa di una pagina delle sezioni lunghe (PESTEL, Porter...)
+PAGE_CHARS = 6000
+
+
+@dataclass(frozen=True)
+class RenderedSection:
+    blocks: tuple  # HTML di titolo, paragrafi ed elenchi, uno per blocco
+
+    @property
+    def html(self):
+        return "\n".join(self.blocks)
+
+    def pages(self, max_chars=PAGE_CHARS):
+        """HTML della sezione in pagine di circa ``max_chars`` caratteri, senza spezzare i blocchi."""
+        pages, current, size = [], [], 0
+        for block in self.blocks:
+            if current and size + len(block) > max_chars:
+                pages.append("\n".join(current))
+                current, size = [], 0
+            current.append(block)
+            size += len(block)
+        pages.append("\n".join(current))
+        return pages
+
+
+def _inline(text):
+    return _INLINE.renderInline(text.strip())
+
+
+def render_blocks(text, heading=False):
+    """Blocchi HTML sanificati di ``text``; con ``heading`` la prima riga è il titolo."""
+    blocks, items = [], []
+
+    def close_list():
+        if items:
+            blocks.append("<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>")
+            items.clear()
+
+    for line in text.splitlines():
+        if not line.strip():
+            close_list()
+            continue
+        if heading:
+            blocks.append(f'<div class="section-title">{html.escape(line.strip())}</div>')
+            heading = False
+            continue
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            items.append(_inline(line[bullet.end():]))
+            continue
+        close_list()
+        blocks.append(f"<p>{_inline(line)}</p>")
+    close_list()
+    return tuple(blocks)
+
+
+def fragment_digest(text, heading=False):
+    key = f"{RENDERER_VERSION}\n{int(heading)}\n{text}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+
+
+def _fragment_path(digest, out_dir=HTML_DIR):
+    return os.path.join(out_dir, f"{digest}.html")
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _fragment_by_digest(digest, _text, heading):
+    # Il testo non entra nella chiave (prefisso "_"): lo rappresenta il digest
+    try:
+        with open(_fragment_path(digest), encoding="utf-8") as file:
+            return RenderedSection(tuple(file.read().splitlines()))
+    except FileNotFoundError:
+        return RenderedSection(render_blocks(_text, heading))
+
+
+def rendered_text(text, heading=False):
+    """``RenderedSection`` di un testo del report (pre-renderizzato se disponibile)."""
+    return _fragment_by_digest(fragment_digest(text, heading), text, heading)
+
+
+def rendered_section(section):
+    """``RenderedSection`` di una ``AnalysisSection``, titolo compreso."""
+    return rendered_text(section.text, heading=True)
+
+
+def _fragments(analysis):
+    """Testi da pre-renderizzare di un report: ``(testo, heading)``."""
+    yield analysis.executive_summary, False
+    for section in analysis.sections.values():
+        yield section.text, True
+
+
+def _report_paths():
+    with open(REGISTRY_PATH, encoding="utf-8") as file:
+        registry = json.load(file)
+    paths = {info["analisi"] for info in registry["tickers"].values() if info.get("analisi")}
+    return sorted(os.path.join(ROOT, path) for path in paths)
+
+
+def build(reports=None, out_dir=HTML_DIR, prune=True):
+    """Converte i frammenti nuovi o modificati; restituisce i conteggi ``(scritti, invariati, rimossi)``."""
+    os.makedirs(out_dir, exist_ok=True)
+    written, unchanged, referenced = 0, 0, set()
+    for report in reports or _report_paths():
+        with open(report, encoding="utf-8") as file:
+            analysis = parse_analysis(file.read())
+        for text, heading in _fragments(analysis):
+            digest = fragment_digest(text, heading)
+            referenced.add(digest)
+            path = _fragment_path(digest, out_dir)
+            if os.path.exists(path):
+                unchanged += 1
+                continue
+            temporary = f"{path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                file.write("\n".join(render_blocks(text, heading)) + "\n")
+            os.replace(temporary, path)
+            written += 1
+
+    removed = 0
+    if prune:
+        for name in os.listdir(out_dir):
+            if name.endswith(".html") and name[:-len(".html")] not in referenced:
+                os.remove(os.path.join(out_dir, name))
+                removed += 1
+    return written, unchanged, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-renderizza in HTML le sezioni dei report di analisi")
+    parser.add_argument("--report", action="append", help="report da convertire (default: quelli del registro)")
+    parser.add_argument("--out", default=HTML_DIR)
+    parser.add_argument("--no-prune", action="store_true", help="non rimuovere i frammenti non più usati")
+    args = parser.parse_args()
+    written, unchanged, removed = build(args.report, args.out, prune=not args.no_prune)
+    print(f"{written} frammenti convertiti, {unchanged} invariati, {removed} rimossi -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
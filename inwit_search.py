@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Ricerca full-text nel report di analisi.
+
+L'indice invertito (termine -> paragrafi in cui compare, con frequenza) è
+costruito una sola volta per versione del report, a partire dalle sezioni
+già analizzate da ``inwit_analysis``, e condiviso tra le sessioni: l'hash
+del report è la chiave della cache. I paragrafi sono le righe non vuote di
+ciascuna sezione (Executive Summary compreso).
+
+Il tokenizer è pensato per l'italiano:
+
+- insensibile a maiuscole e accenti ("perché" = "perche", "società" = "societa");
+- separa gli articoli elisi ("dell’acquisizione" -> "acquisizione");
+- ignora le parole vuote più comuni ("di", "che", "della"...);
+- tronca la vocale finale delle parole lunghe, così singolare e plurale
+  coincidono ("torre"/"torri", "dividendo"/"dividendi").
+
+I risultati sono ordinati con BM25 sui paragrafi; il punteggio di una
+sezione è la somma di quello dei suoi paragrafi. Un termine della query
+che non compare nell'indice viene esteso ai termini che iniziano con esso
+("coven" trova "covenant"). Una ricerca richiede pochi millisecondi.
+"""
+import bisect
+import html
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+
+import streamlit as st
+
+from inwit_fragments import fragment
+from inwit_profiling import span
+
+# Parametri standard di BM25
+_K1 = 1.2
+_B = 0.75
+
+_WORD_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset("""
+a ad al agli ai all alla alle allo anche che chi ci coi col come con cui da dagli dai dal dall
+dalla dalle dallo degli dei del dell della delle dello di e ed gli ha hanno i il in l la le lo
+ma nei nel nell nella nelle nello o per piu poi quale quali quando se si sono su sua sue sui sul
+sull sulla sulle suo suoi tra fra un una uno essere stato stata sia tale tali questo questa
+queste questi quello quella ne non
+""".split())
+
+
+def _fold(word):
+    """Minuscolo e senza accenti."""
+    decomposed = unicodedata.normalize("NFKD", word.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _stem(word):
+    # Stemming leggero: solo la vocale finale (genere e numero)
+    if len(word) > 4 and word[-1] in "aeio" and not word.isdigit():
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Termini indicizzati di ``text``, con le posizioni ``(inizio, fine)`` nel testo originale."""
+    terms = []
+    for match in _WORD_RE.finditer(text):
+        word = _fold(match.group())
+        if word in STOPWORDS or word == "_":
+            continue
+        terms.append((_stem(word), match.start(), match.end()))
+    return terms
+
+
+def query_terms(query):
+    return list(dict.fromkeys(term for term, _, _ in tokenize(query)))
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    section: int  # numero della sezione del report, 0 per l'Executive Summary
+    title: str
+    text: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    paragraph: Paragraph
+    score: float
+    snippet: str  # HTML, con i termini trovati in <mark>
+
+
+class SearchIndex:
+    """Indice invertito dei paragrafi del report."""
+
+    def __init__(self, paragraphs):
+        self.paragraphs = paragraphs
+        self.postings = defaultdict(dict)  # termine -> {paragrafo: frequenza}
+        self.lengths = []
+        for i, paragraph in enumerate(paragraphs):
+            terms = tokenize(paragraph.text)
+            self.lengths.append(len(terms))
+            for term, _, _ in terms:
+                self.postings[term][i] = self.postings[term].get(i, 0) + 1
+        self.postings = dict(self.postings)
+        self.vocabulary = sorted(self.postings)
+        self.average_length = sum(self.lengths) / max(len(self.lengths), 1)
+
+    def expand(self, term):
+        """Termini dell'indice corrispondenti a ``term``: sé stesso o, se assente, quelli con questo prefisso."""
+        if term in self.postings:
+            return [term]
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + "\uffff")
+        return self.vocabulary[start:end]
+
+    def _idf(self, term):
+        n = len(self.postings[term])
+        return math.log(1 + (len(self.paragraphs) - n + 0.5) / (n + 0.5))
+
+    def scores(self, query):
+        """Punteggio BM25 dei paragrafi che contengono almeno un termine di ``query``."""
+        scores = defaultdict(float)
+        matched = set()
+        for term in query_terms(query):
+            for indexed in self.expand(term):
+                matched.add(indexed)
+                idf = self._idf(indexed)
+                for i, tf in self.postings[indexed].items():
+                    norm = _K1 * (1 - _B + _B * self.lengths[i] / self.average_length)
+                    scores[i] += idf * tf * (_K1 + 1) / (tf + norm)
+        return scores, matched
+
+    def search(self, query, limit=10, context=90):
+        """Paragrafi più rilevanti per ``query``, con estratto evidenziato."""
+        scores, matched = self.scores(query)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [SearchHit(self.paragraphs[i], score, snippet(self.paragraphs[i].text, matched, context))
+                for i, score in ranked]
+
+    def section_scores(self, query):
+        """Sezioni ordinate per punteggio complessivo: lista di ``(numero, titolo, punteggio, paragrafi)``."""
+        scores, _ = self.scores(query)
+        sections = {}
+        for i, score in scores.items():
+            paragraph = self.paragraphs[i]
+            _, _, total, count = sections.get(paragraph.section, (0, "", 0.0, 0))
+            sections[paragraph.section] = (paragraph.section, paragraph.title, total + score, count + 1)
+        return sorted(sections.values(), key=lambda item: (-item[2], item[0]))
+
+
+def snippet(text, terms, context=90):
+    """Estratto di ``text`` attorno alla zona con più termini di ``terms``, evidenziati con ``<mark>``."""
+    hits = [(start, end) for term, start, end in tokenize(text) if term in terms]
+    if not hits:
+        return html.escape(text[:2 * context]) + ("…" if len(text) > 2 * context else "")
+
+    # Finestra di 2 x context caratteri che contiene più occorrenze
+    best, best_count = 0, 0
+    for i, (start, _) in enumerate(hits):
+        count = sum(1 for s, _ in hits[i:] if s < start + 2 * context)
+        if count > best_count:
+            best, best_count = i, count
+    begin = max(hits[best][0] - context // 3, 0)
+    end = min(begin + 2 * context, len(text))
+    if begin > 0:
+        # Si parte da un inizio di parola
+        space = text.find(" ", begin)
+        begin = space + 1 if 0 <= space < hits[best][0] else begin
+
+    parts = ["…" if begin > 0 else ""]
+    position = begin
+    for start, stop in hits:
+        if start < begin or stop > end:
+            continue
+        parts.append(html.escape(text[position:start]))
+        parts.append(f"<mark>{html.escape(text[start:stop])}</mark>")
+        position = stop
+    parts.append(html.escape(text[position:end]))
+    parts.append("…" if end < len(text) else "")
+    return "".join(parts)
+
+
+def _paragraphs(analysis):
+    sections = [(0, "Executive Summary", analysis.executive_summary)]
+    sections += [(s.number, s.title, s.body) for s in analysis.sections.values()]
+    return [
+        Paragraph(number, title, line.strip())
+        for number, title, text in sections
+        for line in text.splitlines()
+        if line.strip()
+    ]
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _index_by_digest(digest, _analysis):
+    # Come per il parsing, la chiave è l'hash del report
+    return SearchIndex(_paragraphs(_analysis))
+
+
+def search_index(analysis):
+    """``SearchIndex`` dell'``AnalysisIndex`` ``analysis``, costruito una volta per versione del report."""
+    with span("compute", "search_index"):
+        return _index_by_digest(analysis.digest, analysis)
+
+
+def _section_label(number, title):
+    return title if number == 0 else f"{number}. {title}"
+
+
+def render_sidebar_search(company, limit=8):
+    """Casella di ricerca nel report, con i risultati nella sidebar."""
+    if not company.get("analisi"):
+        return
+    with st.sidebar:
+        _search_panel(company, limit)
+
+
+@fragment
+def _search_panel(company, limit):
+    # Frammento: una nuova ricerca non riesegue la pagina
+    query = st.text_input("🔍 Cerca nel report:", key="report_search",
+                          placeholder="es. covenant, Iliad, 5G")
+    if not query_terms(query):
+        return
+
+    from inwit_analysis import load_analysis
+
+    index = search_index(load_analysis(company["analisi"]))
+    with span("compute", "search"):
+        hits = index.search(query, limit=limit)
+        sections = index.section_scores(query)
+    if not hits:
+        st.caption(f"Nessun risultato per \"{query}\".")
+        return
+
+    found = ", ".join(_section_label(number, title) for number, title, _, _ in sections[:3])
+    st.caption(f"{sum(count for *_, count in sections)} paragrafi in {len(sections)} sezioni. "
+               f"Più rilevanti: {found} (📋 Analisi Completa).")
+    for hit in hits:
+        st.markdown(
+            f'<div class="search-hit"><strong>{html.escape(_section_label(hit.paragraph.section, hit.paragraph.title))}'
+            f"</strong><br>{hit.snippet}</div>",
+            unsafe_allow_html=True,
+        )
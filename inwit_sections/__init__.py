@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Pagine della dashboard: un modulo per sezione.
+
+Ogni modulo dichiara in ``FRAMES`` le tabelle dell'archivio dati (e le sole
+colonne) che gli servono, ed espone ``render(frames, company)``, dove
+``company`` è la scheda del titolo dal registro, con i valori dello scenario
+what-if (le tabelle che ne dipendono arrivano già ricalcolate). Il modulo viene importato
+solo alla prima visita della sezione e poi resta in ``sys.modules``: le
+navigazioni successive non lo ri-eseguono.
+"""
+import importlib
+import os
+
+import streamlit as st
+
+from inwit_data import load_frames
+from inwit_profiling import span
+from inwit_whatif import adjust_frames
+
+
+def render_section(section_id, company):
+    """Importa (solo alla prima visita) e disegna la sezione ``section_id`` per il titolo."""
+    with span("import", section_id):
+        module = importlib.import_module(f"{__name__}.{section_id}")
+    try:
+        with span("data", section_id):
+            frames = adjust_frames(load_frames(company["ticker"], module.FRAMES), company)
+    except FileNotFoundError as exc:
+        table = os.path.splitext(os.path.basename(exc.filename))[0]
+        st.info(f"Dati non disponibili per {company['ticker']} (tabella '{table}').")
+        return
+    with span("section", section_id):
+        module.render(frames, company)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Sezione "🏗️ Business Model Torri" della dashboard."""
+import streamlit as st
+
+from inwit_commentary import render_commentary
+from inwit_figures import get_figure
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'business_metrics': None,
+}
+
+
+def render(frames, company):
+    df_business_metrics = frames['business_metrics']
+    
+    st.subheader("🏗️ Business Model: Tower as a Service")
+    
+    # Metriche chiave del business
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.plotly_chart(get_figure("torri", df_business_metrics), use_container_width=True)
+    
+    with col2:
+        obiettivo = company.get("obiettivi", {}).get("tenancy_ratio")
+        st.plotly_chart(get_figure("tenancy", df_business_metrics, obiettivo=obiettivo, anno=company["anno_fine_piano"]),
+                        use_container_width=True)
+    
+    with col3:
+        st.plotly_chart(get_figure("arpu", df_business_metrics), use_container_width=True)
+    
+    # Modello di Business - Infografica
+    render_commentary(company, "business_model")
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Sezione "🎯 Conclusioni" della dashboard."""
+from dataclasses import replace
+
+import streamlit as st
+
+from inwit_assets import render_disclaimer
+from inwit_commentary import render_commentary
+from inwit_figures import get_figure
+from inwit_fragments import fragment
+from inwit_valuation import default_spec, valuation_surface
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'risk_return': None,
+    'dps_projection': None,
+}
+
+
+def render(frames, company):
+    df_risk_return = frames['risk_return']
+    df_dps_projection = frames['dps_projection']
+    
+    st.subheader("🎯 Conclusioni e Considerazioni")
+    
+    # Summary metrics (TSR e fair value dalla valutazione del report, se il titolo ne ha una)
+    valutazione = company.get("valutazione", {})
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if "tsr_atteso" in valutazione:
+            st.metric("TSR atteso (annuo)", valutazione["tsr_atteso"],
+                      help="Total Shareholder Return: dividendi + crescita prezzo")
+    
+    with col2:
+        st.metric("Dividend CAGR obiettivo", f"{company['crescita_dps']:.1%}",
+                  help=f"Crescita dividendi pianificata {company['anno_ultimo_dps'] + 1}-{company['anno_fine_piano']}")
+    
+    with col3:
+        if "fair_value" in valutazione:
+            st.metric("Fair Value stimato", valutazione["fair_value"], help="Target price basato su DCF e multipli")
+    
+    # Valutazione DDM a più stadi
+    render_ddm(df_dps_projection, company)
+    
+    # Considerazioni sull'investimento
+    render_commentary(company, "conclusions")
+    
+    # Risk-Return Profile
+    st.subheader("📊 Profilo Rischio-Rendimento")
+    
+    # Creazione scatter plot risk-return
+    st.plotly_chart(get_figure("risk_return", df_risk_return, nome=company["nome_breve"]), use_container_width=True)
+    
+    # Footer standard con disclaimer
+    st.markdown("---")
+    render_disclaimer()
+
+
+@fragment
+def render_ddm(df_dps_projection, company):
+    """Fair value con Dividend Discount Model a tre stadi e crescita implicita nel prezzo."""
+    spec = default_spec(df_dps_projection, company)
+    prezzo = spec.price
+    
+    with st.expander("🧮 Valutazione DDM: Fair Value e Crescita Implicita", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            ke = st.slider("Costo del capitale proprio (%)", spec.ke_min * 100, spec.ke_max * 100, 7.0, 0.1,
+                           key="ddm_ke")
+        with col2:
+            g1 = st.slider("Crescita esplicita DPS (%)", spec.g1_min * 100, spec.g1_max * 100, 3.0, 0.25,
+                           key="ddm_g1")
+        with col3:
+            g2 = st.slider("Crescita terminale (%)", spec.g2_min * 100, spec.g2_max * 100, 1.5, 0.1,
+                           key="ddm_g2")
+        with col4:
+            explicit_years = st.slider("Anni a crescita esplicita", 0, 15, spec.explicit_years, 1,
+                                       key="ddm_years")
+        
+        spec = replace(spec, explicit_years=explicit_years)
+        surface = valuation_surface(spec)
+        ke, g1, g2 = ke / 100, g1 / 100, g2 / 100
+        fair_value = surface.at(ke, g1, g2)
+        implied = surface.implied_growth(ke, g1)
+        last_year = spec.base_year + len(spec.dividends)
+        
+        m1, m2, m3 = st.columns(3)
+        m1.metric(
+            "Fair value DDM",
+            f"€{fair_value:.2f}" if fair_value == fair_value else "n.d.",
+            delta=f"{fair_value / prezzo - 1:+.1%} vs €{prezzo:.2f}" if fair_value == fair_value else None,
+            help="Crescita terminale pari o superiore al costo del capitale: valore non definito"
+                 if fair_value != fair_value else None
+        )
+        m2.metric(
+            "Crescita terminale implicita",
+            f"{implied:.2%}" if implied == implied else "n.d.",
+            help=f"Crescita perpetua del DPS che, con costo del capitale {ke:.1%} e crescita esplicita "
+                 f"{g1:.2%}, giustifica il prezzo di €{prezzo:.2f}"
+        )
+        m3.metric(
+            "Valore dai DPS di piano",
+            f"€{sum(d / (1 + ke) ** (i + 1) for i, d in enumerate(spec.dividends)):.2f}",
+            help=f"Valore attuale dei DPS {spec.base_year + 1}-{last_year}"
+        )
+        
+        st.plotly_chart(
+            get_figure("ddm_surface", surface.frame(g1), g1=g1, prezzo=prezzo, ke_rif=ke, g2_rif=g2),
+            use_container_width=True
+        )
+        g1_curves = sorted({0.0, round(g1, 4), 0.05})
+        st.plotly_chart(
+            get_figure("ddm_implied", surface.implied_frame(g1_curves), prezzo=prezzo),
+            use_container_width=True
+        )
+        st.caption(
+            f"DPS {spec.base_year + 1}-{last_year} da proiezione "
+            f"({', '.join(f'€{d:.3f}' for d in spec.dividends)}), poi {explicit_years} anni a crescita "
+            f"esplicita e rendita perpetua (Gordon). Valutazione a fine {spec.base_year}. La linea "
+            f"tratteggiata indica le combinazioni che giustificano il prezzo corrente."
+        )
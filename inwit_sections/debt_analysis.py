@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""Sezione "⚖️ Analisi Debito" della dashboard."""
+from dataclasses import replace
+
+import streamlit as st
+
+from inwit_commentary import render_commentary
+from inwit_data import year_annotations
+from inwit_debt import debt_simulation, default_spec
+from inwit_figures import get_figure
+from inwit_fragments import fragment
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'debt_analysis': ['Anno', 'Debito Netto (€M)', 'EBITDA (€M)', 'ND/EBITDA', 'Target ND/EBITDA', 'Interest Cover'],
+    'debt_structure': None,
+    'dps_projection': None,
+}
+
+# Metriche del grafico per scenario: attributo della simulazione, soglia di riferimento
+# (un nome indica il campo del registro con la soglia del titolo, es. il covenant)
+SCENARIO_METRICS = {
+    "Oneri Finanziari (€M)": ("interest", None),
+    "Interest Cover (x)": ("cover", 4.0),
+    "ND/EBITDA (x)": ("leverage", "covenant_nd_ebitda"),
+}
+
+
+def render(frames, company):
+    df_debt_analysis = frames['debt_analysis']
+    df_debt_structure = frames['debt_structure']
+    
+    st.subheader("⚖️ Analisi del Debito e Leva Finanziaria")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Evoluzione Net Debt/EBITDA
+        eventi = year_annotations(company["ticker"], "evento")
+        st.plotly_chart(get_figure("leverage", df_debt_analysis, eventi=eventi), use_container_width=True)
+    
+    with col2:
+        # Interest coverage
+        st.plotly_chart(get_figure("coverage", df_debt_analysis), use_container_width=True)
+    
+    # Struttura del debito - CORRETTO CON EXPANDER
+    with st.expander("💳 Struttura del Debito", expanded=True):
+        # Formattazione corretta della struttura del debito
+        st.dataframe(
+            df_debt_structure,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Strumento": st.column_config.TextColumn(
+                    "Strumento",
+                    help="Tipologia di strumento di debito"
+                ),
+                "Importo (€M)": st.column_config.NumberColumn(
+                    "Importo (€M)",
+                    help="Importo in milioni di euro",
+                    format="%.0f"
+                ),
+                "Tasso (%)": st.column_config.Column(
+                    "Tasso (%)",
+                    help="Tasso di interesse applicato"
+                ),
+                "Scadenza": st.column_config.TextColumn(
+                    "Scadenza",
+                    help="Anno di scadenza"
+                ),
+                "Note": st.column_config.TextColumn(
+                    "Note",
+                    help="Informazioni aggiuntive"
+                )
+            }
+        )
+    
+    render_commentary(company, "debt_structure")
+    
+    # Simulatore di rifinanziamento
+    render_refinancing(df_debt_analysis, df_debt_structure, frames['dps_projection'], company)
+
+
+@fragment
+def render_refinancing(df_debt_analysis, df_debt_structure, df_dps_projection, company):
+    """Rinnovo degli strumenti alla scadenza per scenario di tasso: oneri, Interest Cover e leva."""
+    spec = default_spec(df_debt_analysis, df_debt_structure, df_dps_projection, company)
+    
+    with st.expander("🔄 Simulatore di Rifinanziamento e Costo del Debito", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            euribor_start = st.slider(f"EURIBOR {spec.base_year} (%)", 0.0, 6.0, spec.euribor_start * 100, 0.25,
+                                      key="debt_euribor_start")
+        with col2:
+            euribor_end = st.slider("EURIBOR a fine orizzonte (%)", 0.0, 6.0, spec.euribor_end * 100, 0.25,
+                                    key="debt_euribor_end")
+        with col3:
+            refi_spread = st.slider("Spread nuovi bond (bps)", 0, 400, int(round(spec.refi_spread * 10_000)), 25,
+                                    key="debt_refi_spread")
+        with col4:
+            horizon = st.slider("Orizzonte (anni)", 3, 10, len(spec.years), 1, key="debt_horizon")
+        
+        if horizon != len(spec.years):
+            spec = default_spec(df_debt_analysis, df_debt_structure, df_dps_projection, company, horizon=horizon)
+        spec = replace(spec, euribor_start=euribor_start / 100, euribor_end=euribor_end / 100,
+                       refi_spread=refi_spread / 10_000)
+        simulation = debt_simulation(spec)
+        
+        # Tutti gli scenari sono già calcolati: la scelta dello scenario non ricalcola nulla
+        shift = st.select_slider("Spostamento parallelo della curva (bps)", options=list(spec.shifts), value=0,
+                                 key="debt_shift")
+        s = simulation.scenario(shift)
+        shift = float(simulation.shifts[s])
+        df_scenario = simulation.frame(shift)
+        last_year = spec.years[-1]
+        
+        covenant = company.get("covenant_nd_ebitda")
+        m1, m2, m3 = st.columns(3)
+        reference = simulation.scenario(0)
+        m1.metric(
+            f"Oneri finanziari {last_year}",
+            f"€{simulation.interest[s, -1]:.0f}M",
+            delta=f"{simulation.interest[s, -1] - simulation.interest[reference, -1]:+.0f}M vs curva di riferimento"
+                  if s != reference else None,
+            delta_color="inverse"
+        )
+        m2.metric(
+            f"Interest Cover {last_year}",
+            f"{simulation.cover[s, -1]:.1f}x",
+            help=f"Minimo nell'orizzonte: {simulation.cover[s].min():.1f}x"
+        )
+        m3.metric(
+            f"ND/EBITDA {last_year}",
+            f"{simulation.leverage[s, -1]:.1f}x",
+            help=f"Covenant: Net Debt/EBITDA < {covenant:.1f}x" if covenant is not None else None
+        )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(get_figure("debt_interest", df_scenario, shift=shift, altri_oneri=spec.other_interest),
+                            use_container_width=True)
+        with col2:
+            metrica = st.radio("Metrica per scenario", list(SCENARIO_METRICS), horizontal=True,
+                               key="debt_metric")
+            attribute, soglia = SCENARIO_METRICS[metrica]
+            if isinstance(soglia, str):
+                soglia = company.get(soglia)
+            st.plotly_chart(
+                get_figure("debt_scenarios", simulation.scenarios_frame(attribute), metrica=metrica,
+                           shift=shift, soglia=soglia),
+                use_container_width=True
+            )
+        
+        st.dataframe(df_scenario.round(2), use_container_width=True, hide_index=True)
+        floating = sum(instrument.floating for instrument in spec.instruments)
+        fixed = len(spec.instruments) - floating
+        rates = []
+        if fixed:
+            rates.append(f"{fixed} a tasso fisso a EURIBOR dell'anno di rinnovo + spread")
+        if floating:
+            rates.append(f"{floating} a tasso variabile a EURIBOR + spread originario")
+        st.caption(
+            f"Strumenti con scadenza rinnovati per lo stesso importo, poi ogni {spec.refi_tenor} anni: "
+            f"{', '.join(rates)}. "
+            f"Leasing e altri oneri (€{spec.other_interest:.0f}M annui) calibrati sull'Interest Cover "
+            f"{spec.base_year} e costanti. Debito netto da FCF di piano meno dividendi, più il maggior costo "
+            f"netto degli interessi rispetto alla curva di riferimento; oltre il piano crescita del {spec.growth:.0%} annuo. "
+            f"Scenari da {min(spec.shifts):+d} a {max(spec.shifts):+d} bps calcolati insieme."
+        )
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Sezione "📈 Analisi Dividendi" della dashboard."""
+import streamlit as st
+
+from inwit_assets import render_disclaimer
+from inwit_commentary import render_commentary
+from inwit_data import year_annotations
+from inwit_figures import get_figure
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'dps': ['Anno Esercizio', 'DPS Ordinario (€)', 'DPS Straordinario (€)', 'Variazione %'],
+}
+
+
+def render(frames, company):
+    df_dps = frames['dps']
+    
+    st.subheader("📈 Evoluzione del Dividendo")
+    
+    # Layout a 2 colonne
+    col1, col2 = st.columns(2)
+    
+    # GRAFICO 1: Storico DPS - split normale/straordinario
+    with col1:
+        eventi = year_annotations(company["ticker"], "evento_dividendo")
+        st.plotly_chart(get_figure("dps", df_dps, eventi=eventi), use_container_width=True)
+    
+    # GRAFICO 2: Crescita percentuale YoY (ordinario)
+    with col2:
+        st.plotly_chart(get_figure("growth", df_dps, crescita=company["crescita_dps"]), use_container_width=True)
+    
+    # Insight box
+    render_commentary(company, "dividends")
+    
+    # Footer standard con disclaimer
+    st.markdown("---")
+    render_disclaimer()
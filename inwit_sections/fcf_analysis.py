@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Sezione "💰 Sostenibilità FCF" della dashboard."""
+from dataclasses import replace
+
+import streamlit as st
+
+from inwit_commentary import render_commentary
+from inwit_figures import get_figure
+from inwit_fragments import fragment
+from inwit_montecarlo import calibrate, run_coverage_simulation
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'fcf_analysis': ['Anno', 'FCF (€M)', 'DPS (€)', 'Azioni (M)', 'Dividendi Totali (€M)', 'Copertura FCF'],
+    'payout': ['Anno', 'Payout Ratio EPS (%)'],
+    'stress_test': None,
+}
+
+# Numero di percorsi selezionabili per la simulazione Monte Carlo
+PATHS_OPTIONS = [100_000, 250_000, 500_000, 1_000_000]
+
+
+def render(frames, company):
+    df_fcf_analysis = frames['fcf_analysis']
+    df_payout = frames['payout']
+    df_stress = frames['stress_test']
+    
+    st.subheader("💰 Sostenibilità del Free Cash Flow")
+    
+    # GRAFICO: FCF vs Dividendi Pagati
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(get_figure("fcf", df_fcf_analysis), use_container_width=True)
+    
+    with col2:
+        # Payout ratio analysis
+        st.plotly_chart(get_figure("payout", df_payout, payout_fcf=company["payout_fcf"]), use_container_width=True)
+    
+    # Stress test dividendi - CORRETTO CON EXPANDER
+    with st.expander("🧪 Stress Test: Sostenibilità Dividendo", expanded=True):
+        # Formatta correttamente lo stress test
+        st.dataframe(
+            df_stress,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Scenario": st.column_config.TextColumn(
+                    "Scenario",
+                    help="Scenario di stress test"
+                ),
+                "FCF 2024 (€M)": st.column_config.NumberColumn(
+                    "FCF 2024 (€M)",
+                    help="Free Cash Flow stimato",
+                    format="%.1f"
+                ),
+                "Dividendi Totali (€M)": st.column_config.NumberColumn(
+                    "Dividendi Totali (€M)",
+                    help="Totale dividendi distribuiti",
+                    format="%.1f"
+                ),
+                "Copertura": st.column_config.NumberColumn(
+                    "Copertura",
+                    help="Rapporto FCF/Dividendi",
+                    format="%.2f"
+                ),
+                "Sostenibilità": st.column_config.TextColumn(
+                    "Sostenibilità",
+                    help="Valutazione della sostenibilità del dividendo"
+                )
+            }
+        )
+    
+    render_commentary(company, "fcf_stress_test")
+    
+    render_monte_carlo(df_fcf_analysis, company)
+
+
+@fragment
+def render_monte_carlo(df_fcf_analysis, company):
+    """Simulazione Monte Carlo della copertura FCF, con parametri modificabili (rerun parziale)."""
+    defaults = calibrate(df_fcf_analysis, company)
+    
+    with st.expander("🎲 Simulazione Monte Carlo: Copertura FCF", expanded=True):
+        st.caption(
+            f"Percorsi congiunti di FCF, azioni in circolazione e crescita DPS "
+            f"(da €{defaults.dps_base:.3f}, politica: +{defaults.dps_growth:.1%} annuo) "
+            f"fino al {defaults.base_year + defaults.years}. "
+            f"I valori di default sono stimati sullo storico {int(df_fcf_analysis['Anno'].iloc[0])}-{defaults.base_year}."
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            fcf_drift = st.slider(
+                "Crescita FCF attesa (% annuo)", -20.0, 30.0, round(defaults.fcf_drift * 100, 1), 0.5,
+                key="mc_fcf_drift"
+            )
+            fcf_vol = st.slider(
+                "Volatilità FCF (%)", 0.0, 80.0, round(defaults.fcf_vol * 100, 1), 0.5,
+                key="mc_fcf_vol"
+            )
+        with col2:
+            dps_growth_vol = st.slider(
+                "Scostamento crescita DPS (pp)", 0.0, 10.0, defaults.dps_growth_vol * 100, 0.5,
+                key="mc_dps_vol"
+            )
+            fcf_dps_corr = st.slider(
+                "Correlazione FCF / crescita DPS", -1.0, 1.0, defaults.fcf_dps_corr, 0.05,
+                key="mc_corr"
+            )
+        with col3:
+            paths_options = {f"{n:,}".replace(",", "."): n for n in PATHS_OPTIONS}
+            paths = paths_options[st.select_slider(
+                "Percorsi simulati", options=list(paths_options), key="mc_paths"
+            )]
+        
+        params = replace(
+            defaults,
+            fcf_drift=fcf_drift / 100,
+            fcf_vol=fcf_vol / 100,
+            dps_growth_vol=dps_growth_vol / 100,
+            fcf_dps_corr=fcf_dps_corr,
+        )
+        simulation = run_coverage_simulation(params, paths)
+        summary = simulation.summary(1.0)
+        final_year = simulation.year_labels[-1]
+        final = summary.iloc[-1]
+        
+        m1, m2, m3 = st.columns(3)
+        m1.metric(f"P(Copertura < 1.0x) {final_year}", f"{final['P(Copertura < 1.0x)']:.1%}")
+        m2.metric(f"Copertura mediana {final_year}", f"{final['Mediana']:.2f}x")
+        m3.metric(f"Copertura 5° percentile {final_year}", f"{final['P5']:.2f}x")
+        
+        st.plotly_chart(
+            get_figure("coverage_mc", simulation.histogram(), anno=final_year),
+            use_container_width=True
+        )
+        st.dataframe(
+            summary,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Anno": st.column_config.NumberColumn("Anno", format="%d"),
+                **{c: st.column_config.NumberColumn(c, format="%.2fx") for c in ["P5", "P25", "Mediana", "P75", "P95"]},
+                "P(Copertura < 1.0x)": st.column_config.NumberColumn(
+                    "P(Copertura < 1.0x)",
+                    help="Quota dei percorsi in cui il FCF non copre i dividendi",
+                    format="%.3f"
+                ),
+            }
+        )
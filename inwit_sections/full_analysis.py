@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Sezione "📋 Analisi Completa" della dashboard."""
+import streamlit as st
+
+from inwit_analysis import load_analysis
+from inwit_assets import render_disclaimer
+from inwit_commentary import render_commentary
+from inwit_fragments import fragment
+from inwit_report_html import rendered_section, rendered_text
+
+
+# Il report non usa tabelle dell'archivio dati
+FRAMES = {}
+
+# Chiave di session_state che fa disegnare tutte le schede e tutte le sezioni
+# aperte, come prima della paginazione: la usa l'esportazione statica.
+RENDER_ALL_KEY = "analysis_render_all"
+
+
+@fragment
+def render_selected_tab(tabs):
+    """Selettore delle schede e scheda selezionata: cambiare scheda non riesegue il resto della pagina."""
+    selected_tab = st.radio("Capitolo:", list(tabs), horizontal=True, key="analysis_tab")
+    tabs[selected_tab]()
+
+
+def render(frames, company):
+    st.subheader(f"📋 Analisi Completa di {company['nome_breve']}")
+
+    if not company.get("analisi"):
+        st.info(f"Report di analisi non disponibile per {company['ticker']}.")
+        return
+
+    # Indice delle sezioni del report (analizzato una volta, vedi inwit_analysis.py)
+    analysis = load_analysis(company["analisi"])
+    executive_summary = analysis.executive_summary
+    render_all = st.session_state.get(RENDER_ALL_KEY, False)
+
+    # Aprire una sezione o cambiarne pagina riesegue solo la sezione stessa
+    @fragment
+    def render_analysis_section(number, label, css_class="analysis-section"):
+        section = analysis.get(number)
+        if section is None:
+            return
+        # HTML pre-renderizzato della sezione (vedi inwit_report_html.py)
+        rendered = rendered_section(section)
+        if render_all:
+            with st.expander(label, expanded=True):
+                st.markdown(f'<div class="{css_class}">{rendered.html}</div>', unsafe_allow_html=True)
+            return
+        # Chiusa di default: il testo viene inviato al browser solo quando la sezione è aperta
+        with st.container(border=True):
+            if not st.toggle(label, key=f"analysis_open_{number}"):
+                return
+            pages = rendered.pages()
+            page = 1
+            if len(pages) > 1:
+                page = st.radio("Pagina:", range(1, len(pages) + 1), horizontal=True,
+                                key=f"analysis_page_{number}")
+            st.markdown(f'<div class="{css_class}">{pages[page - 1]}</div>', unsafe_allow_html=True)
+
+    # Tab 1: Executive Summary & Overview
+    def tab_overview():
+        st.markdown('<div class="section-title">Executive Summary</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="analysis-section highlight-section">{rendered_text(executive_summary).html}</div>',
+                    unsafe_allow_html=True)
+        
+        # Punti chiave del titolo
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            render_commentary(company, "analysis_key_dividends")
+        
+        with col2:
+            render_commentary(company, "analysis_key_business")
+        
+        with col3:
+            render_commentary(company, "analysis_key_financials")
+        
+        # Sections 1 & 2
+        render_analysis_section(1, "1. Descrizione Aziendale")
+        
+        render_analysis_section(2, "2. Management & Governance")
+    
+    # Tab 2: Business & Strategy
+    def tab_business():
+        render_analysis_section(3, "3. Piano Industriale & Strategia")
+        
+        render_analysis_section(4, "4. Outlook Macroeconomico & Tassi")
+        
+        render_analysis_section(5, "5. Analisi PESTEL")
+        
+        render_analysis_section(6, "6. Analisi delle 5 Forze di Porter")
+    
+    # Tab 3: Analisi Finanziaria
+    def tab_financials():
+        render_analysis_section(7, "7. Andamento Storico dei Dividendi")
+        
+        render_analysis_section(8, "8. Performance Finanziaria (ultimi 5 anni)")
+        
+        render_analysis_section(15, "15. Total Shareholder Return (TSR) comparato")
+    
+    # Tab 4: Valutazione & Scenari
+    def tab_valuation():
+        render_analysis_section(9, "9. Valutazione")
+        
+        render_analysis_section(10, "10. Scenario & Sensitivity Analysis")
+        
+        render_analysis_section(16, "16. Impatto Fiscale sui Dividendi")
+    
+    # Tab 5: Rischi & Opportunità
+    def tab_risks():
+        render_analysis_section(13, "13. Rischi & Catalyst")
+        
+        render_analysis_section(11, "11. Regolamentazione & Rischi Normativi")
+        
+        render_analysis_section(14, "14. Liquidità & Flottante Azionario")
+    
+    # Tab 6: Governance & ESG
+    def tab_governance():
+        render_analysis_section(12, "12. ESG & Sustainability")
+        
+        render_analysis_section(17, "17. Appendice & Metodologia")
+        
+        render_analysis_section(18, "18. Conclusione & Valutazione Finale", "analysis-section highlight-section")
+    
+    # Tab per le sezioni principali: nell'app viene disegnata solo quella
+    # selezionata, nella versione statica (render_all) tutte
+    tabs = {
+        "Executive Summary & Overview": tab_overview,
+        "Business & Strategy": tab_business,
+        "Analisi Finanziaria": tab_financials,
+        "Valutazione & Scenari": tab_valuation,
+        "Rischi & Opportunità": tab_risks,
+        "Governance & ESG": tab_governance,
+    }
+    if render_all:
+        for tab, render_tab in zip(st.tabs(list(tabs)), tabs.values()):
+            with tab:
+                render_tab()
+    else:
+        render_selected_tab(tabs)
+
+    # Summary card finale
+    st.markdown("---")
+    render_commentary(company, "analysis_summary")
+    
+    # Footer standard con disclaimer
+    st.markdown("---")
+    render_disclaimer()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Sezione "🆚 Confronto Settore" della dashboard."""
+import streamlit as st
+
+from inwit_commentary import render_commentary
+from inwit_figures import get_figure
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'yield_comp': None,
+    'multiples': None,
+}
+
+
+def render(frames, company):
+    df_yield_comp = frames['yield_comp']
+    df_multiples = frames['multiples']
+    
+    st.subheader("🆚 Confronto con Settore e Peers")
+    
+    # Confronto dividend yield
+    st.plotly_chart(get_figure("yield_comp", df_yield_comp), use_container_width=True)
+    
+    # Tabella confronto multipli - CORRETTO CON EXPANDER
+    with st.expander("📈 Confronto Multipli di Valutazione", expanded=True):
+        # Formattazione corretta dei multipli
+        st.dataframe(
+            df_multiples,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Società": st.column_config.TextColumn(
+                    "Società",
+                    help="Nome dell'azienda"
+                ),
+                "EV/EBITDA 2024E": st.column_config.Column(
+                    "EV/EBITDA 2024E",
+                    help="Enterprise Value / EBITDA"
+                ),
+                "P/E 2024E": st.column_config.Column(
+                    "P/E 2024E",
+                    help="Price / Earnings"
+                ),
+                "Dividend Yield (%)": st.column_config.NumberColumn(
+                    "Dividend Yield (%)",
+                    help="Rendimento dividendi",
+                    format="%.1f%%"
+                ),
+                "Net Debt/EBITDA": st.column_config.NumberColumn(
+                    "Net Debt/EBITDA",
+                    help="Leva finanziaria",
+                    format="%.1f"
+                ),
+                "Geografie": st.column_config.TextColumn(
+                    "Geografie",
+                    help="Mercati geografici principali"
+                )
+            }
+        )
+    
+    # Posizionamento competitivo
+    render_commentary(company, "peer_positioning")
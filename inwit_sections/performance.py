@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Sezione "💼 Performance Finanziaria" della dashboard."""
+import streamlit as st
+
+from inwit_assets import render_disclaimer
+from inwit_data import year_annotations
+from inwit_figures import get_figure
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'fin_clean': None,
+}
+
+
+def render(frames, company):
+    df_fin_clean = frames['fin_clean']
+    
+    st.subheader("💼 Performance Finanziaria")
+    
+    # GRAFICO: Evoluzione Ricavi e Margini
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        eventi = year_annotations(company["ticker"], "evento")
+        st.plotly_chart(get_figure("revenue", df_fin_clean, eventi=eventi), use_container_width=True)
+    
+    with col2:
+        # EBITDA Margin evolution
+        obiettivo = company.get("obiettivi", {}).get("ebitda_margin")
+        st.plotly_chart(get_figure("margin", df_fin_clean, obiettivo=obiettivo), use_container_width=True)
+    
+    # Tabella performance finanziaria - CORRETTO CON EXPANDER
+    with st.expander("📊 Dettaglio Performance Finanziaria", expanded=True):
+        # Preparazione tabella con codice colore
+        df_display = df_fin_clean.round({
+            'Ricavi (€M)': 1,
+            'EBITDA (€M)': 1,
+            'EBITDA Margin (%)': 1,
+            'Utile Netto (€M)': 1,
+            'FCF (€M)': 1,
+            'EPS (€)': 2,
+            'DPS (€)': 3,
+        })
+        
+        st.dataframe(
+            df_display.set_index('Anno'),
+            use_container_width=True,
+            hide_index=False,
+            column_config={
+                "Ricavi (€M)": st.column_config.NumberColumn(
+                    "Ricavi (€M)",
+                    help="Ricavi totali annui",
+                    format="%.1f"
+                ),
+                "EBITDA (€M)": st.column_config.NumberColumn(
+                    "EBITDA (€M)",
+                    help="EBITDA annuale",
+                    format="%.1f"
+                ),
+                "EBITDA Margin (%)": st.column_config.NumberColumn(
+                    "EBITDA Margin (%)",
+                    help="Margine EBITDA",
+                    format="%.1f%%"
+                ),
+                "Utile Netto (€M)": st.column_config.NumberColumn(
+                    "Utile Netto (€M)",
+                    help="Utile netto annuale",
+                    format="%.1f"
+                ),
+                "EPS (€)": st.column_config.NumberColumn(
+                    "EPS (€)",
+                    help="Utile per azione",
+                    format="%.2f"
+                ),
+                "FCF (€M)": st.column_config.NumberColumn(
+                    "FCF (€M)",
+                    help="Free Cash Flow",
+                    format="%.1f"
+                ),
+                "DPS (€)": st.column_config.NumberColumn(
+                    "DPS (€)",
+                    help="Dividendo per azione",
+                    format="%.3f"
+                ),
+                "Fase": st.column_config.TextColumn(
+                    "Fase",
+                    help="Fase dell'azienda"
+                )
+            }
+        )
+    
+    # Footer standard con disclaimer
+    st.markdown("---")
+    render_disclaimer()
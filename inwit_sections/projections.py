@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Sezione "🔮 Proiezioni Future" della dashboard."""
+from dataclasses import replace
+
+import streamlit as st
+
+from inwit_commentary import render_commentary
+from inwit_figures import get_figure
+from inwit_fragments import fragment
+from inwit_sensitivity import default_spec, yield_grid
+
+
+# Tabelle (e colonne) lette dall'archivio dati
+FRAMES = {
+    'dps_projection': None,
+    'projections': None,  # dal piano industriale
+}
+
+
+def render(frames, company):
+    df_dps_projection = frames['dps_projection']
+    df_projections = frames['projections']
+    
+    st.subheader("🔮 Proiezioni Dividendi e Performance")
+    
+    # Grafico proiezioni dividendi
+    st.plotly_chart(get_figure("proj", df_dps_projection, crescita=company["crescita_dps"]), use_container_width=True)
+    
+    render_yield_sensitivity(df_dps_projection, company)
+    
+    # Proiezioni finanziarie - CORRETTO CON EXPANDER
+    with st.expander("📊 Proiezioni Finanziarie (Piano Industriale)", expanded=True):
+        # Formattazione corretta delle proiezioni finanziarie
+        st.dataframe(
+            df_projections.set_index('Metrica'),
+            use_container_width=True,
+            hide_index=False,
+            column_config={
+                "2024E": st.column_config.Column(
+                    "2024E",
+                    help="Stima 2024"
+                ),
+                "2025E": st.column_config.Column(
+                    "2025E",
+                    help="Stima 2025"
+                ),
+                "2026E": st.column_config.Column(
+                    "2026E",
+                    help="Stima 2026"
+                ),
+                "CAGR 24-26": st.column_config.Column(
+                    "CAGR 24-26",
+                    help="Crescita annua composta 2024-2026"
+                )
+            }
+        )
+    
+    # Key drivers crescita
+    render_commentary(company, "projections_drivers")
+
+
+@fragment
+def render_yield_sensitivity(df_dps_projection, company):
+    """Heatmap del rendimento per prezzo di ingresso e crescita del DPS (rerun parziale)."""
+    spec = default_spec(df_dps_projection, company)
+    prezzo = company["prezzo_riferimento"]
+    crescita = company["crescita_dps"]
+    
+    with st.expander("🌡️ Sensitività Yield: Prezzo di Ingresso x Crescita DPS", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            anno = st.select_slider(
+                "Anno", options=list(spec.years), value=spec.years[-1], key="grid_year"
+            )
+        with col2:
+            price_min, price_max = st.slider(
+                "Prezzo di ingresso (€)", round(prezzo * 0.5, 1), round(prezzo * 1.5, 1),
+                (spec.price_min, spec.price_max), 0.1, key="grid_prices"
+            )
+        with col3:
+            growth_min, growth_max = st.slider(
+                "Crescita annua DPS (%)", -10.0, 25.0,
+                (spec.growth_min * 100, spec.growth_max * 100), 0.5, key="grid_growth"
+            )
+        
+        spec = replace(
+            spec,
+            price_min=price_min, price_max=price_max,
+            growth_min=growth_min / 100, growth_max=growth_max / 100,
+        )
+        grid = yield_grid(spec)
+        forward = anno == spec.years[0]
+        
+        st.plotly_chart(
+            get_figure(
+                "yield_grid", grid.frame(anno), anno=anno,
+                prezzo_rif=prezzo, crescita_rif=crescita, forward=forward
+            ),
+            use_container_width=True
+        )
+        
+        m1, m2, m3 = st.columns(3)
+        m1.metric(
+            f"Yield forward {spec.years[0]}",
+            f"{grid.at(spec.years[0], prezzo, crescita):.2f}%",
+            help=f"DPS {spec.years[0]} con crescita {crescita:.1%} su prezzo €{prezzo:.2f}"
+        )
+        m2.metric(
+            f"Yield on cost {anno}",
+            f"{grid.at(anno, prezzo, crescita):.2f}%",
+            help=f"DPS {anno} con crescita {crescita:.1%} su prezzo di ingresso €{prezzo:.2f}"
+        )
+        m3.metric(
+            f"Yield on cost {anno} (prezzo -10%)",
+            f"{grid.at(anno, prezzo * 0.9, crescita):.2f}%",
+            help=f"Ingresso a €{prezzo * 0.9:.2f}"
+        )
+        st.caption(
+            f"DPS base €{spec.dps_base:.3f} ({spec.base_year}). La croce indica il prezzo di "
+            f"riferimento e la crescita programmata; le curve di livello segnano gli yield interi."
+        )
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Sensitività del rendimento da dividendo a prezzo di ingresso e crescita del DPS.
+
+Per una griglia densa di prezzi di ingresso e tassi di crescita annua del
+DPS calcola, con un'unica operazione NumPy in broadcasting
+(``anni x crescite x prezzi``), il DPS di ciascun anno del piano e il
+relativo rendimento sul prezzo di ingresso: il primo anno è lo yield
+forward, gli anni successivi lo yield-on-cost di chi ha comprato a quel
+prezzo. La griglia è in cache per specifica (``GridSpec``).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from inwit_profiling import span
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    dps_base: float     # ultimo DPS confermato (€)
+    base_year: int      # anno del DPS base
+    years: tuple        # anni proiettati (es. 2025, 2026, 2027)
+    price_min: float
+    price_max: float
+    price_step: float
+    growth_min: float   # crescita annua DPS, in frazione
+    growth_max: float
+    growth_step: float
+
+    @property
+    def prices(self):
+        steps = int(round((self.price_max - self.price_min) / self.price_step)) + 1
+        return np.linspace(self.price_min, self.price_max, steps)
+
+    @property
+    def growth_rates(self):
+        steps = int(round((self.growth_max - self.growth_min) / self.growth_step)) + 1
+        return np.linspace(self.growth_min, self.growth_max, steps)
+
+
+@dataclass(frozen=True)
+class YieldGrid:
+    spec: GridSpec
+    prices: np.ndarray        # (prezzi,)
+    growth_rates: np.ndarray  # (crescite,)
+    yields: np.ndarray        # (anni, crescite, prezzi), in %
+
+    def frame(self, year):
+        """Griglia di un anno come DataFrame: righe = crescita (%), colonne = prezzo (€)."""
+        i = self.spec.years.index(year)
+        return pd.DataFrame(
+            self.yields[i],
+            index=pd.Index(np.round(self.growth_rates * 100, 2), name="Crescita DPS (%)"),
+            columns=pd.Index(np.round(self.prices, 2), name="Prezzo (€)"),
+        )
+
+    def at(self, year, price, growth):
+        """Rendimento (%) nel punto della griglia più vicino a ``price`` e ``growth``."""
+        i = self.spec.years.index(year)
+        g = int(np.abs(self.growth_rates - growth).argmin())
+        p = int(np.abs(self.prices - price).argmin())
+        return float(self.yields[i, g, p])
+
+
+def default_spec(df_dps_projection, company, price_range=0.3, growth_range=(0.0, 0.15)):
+    """Griglia centrata sul prezzo di riferimento, sugli anni di piano di ``dps_projection``."""
+    confirmed = df_dps_projection[df_dps_projection["Tipo"] != "Piano"].iloc[-1]
+    base_year = int(confirmed["Anno"])
+    plan_years = tuple(int(y) for y in df_dps_projection["Anno"] if y > base_year)
+    price = float(company["prezzo_riferimento"])
+    return GridSpec(
+        dps_base=float(confirmed["DPS (€)"]),
+        base_year=base_year,
+        years=plan_years,
+        price_min=round(price * (1 - price_range), 1),
+        price_max=round(price * (1 + price_range), 1),
+        price_step=0.1,
+        growth_min=growth_range[0],
+        growth_max=growth_range[1],
+        growth_step=0.0025,
+    )
+
+
+def compute_yield_grid(spec):
+    """Rendimenti (%) su tutta la griglia (senza cache)."""
+    prices = spec.prices
+    growth_rates = spec.growth_rates
+    horizon = np.asarray(spec.years, dtype=float) - spec.base_year
+    # (anni, 1, 1) x (1, crescite, 1) x (1, 1, prezzi) -> (anni, crescite, prezzi)
+    dps = spec.dps_base * (1.0 + growth_rates[None, :, None]) ** horizon[:, None, None]
+    yields = dps / prices[None, None, :] * 100
+    return YieldGrid(spec, prices, growth_rates, yields)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _grid_cached(spec):
+    grid = compute_yield_grid(spec)
+    grid.yields.flags.writeable = False
+    return grid
+
+
+def yield_grid(spec):
+    """Come ``compute_yield_grid``, dalla cache se la specifica è già stata calcolata."""
+    with span("compute", "yield_grid"):
+        return _grid_cached(spec)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Valutazione con Dividend Discount Model a più stadi.
+
+Il valore per azione è la somma attualizzata al costo del capitale proprio
+``ke`` di tre fasi di dividendi, come nella metodologia del report
+(sez. 17):
+
+1. i DPS noti o di piano (righe non storiche di ``dps_projection``; se non
+   ce ne sono, l'ultimo DPS pagato);
+2. ``explicit_years`` anni a crescita esplicita ``g1`` dall'ultimo DPS di piano;
+3. una rendita perpetua a crescita terminale ``g2`` (Gordon).
+
+Con gli anni a crescita esplicita la seconda fase è una serie geometrica in
+forma chiusa, quindi l'intera superficie ``ke x g1 x g2`` si calcola con
+un'unica operazione NumPy in broadcasting. Le combinazioni con ``g2 >= ke``
+(valore infinito) sono ``nan``. Dalla stessa scomposizione si ricava, per
+ogni ``ke`` e ``g1``, la crescita terminale implicita nel prezzo corrente
+(l'equazione di Gordon si inverte in forma chiusa). La superficie è in
+cache per specifica (``DDMSpec``).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from inwit_profiling import span
+
+
+@dataclass(frozen=True)
+class DDMSpec:
+    base_year: int        # anno dell'ultimo DPS pagato: la valutazione è a fine anno
+    dividends: tuple      # DPS noti o di piano, dal base_year + 1
+    explicit_years: int   # anni a crescita esplicita dopo i DPS di piano
+    price: float          # prezzo corrente, per la crescita implicita
+    ke_min: float
+    ke_max: float
+    ke_step: float
+    g1_min: float
+    g1_max: float
+    g1_step: float
+    g2_min: float
+    g2_max: float
+    g2_step: float
+
+    @staticmethod
+    def _axis(low, high, step):
+        steps = int(round((high - low) / step)) + 1
+        return np.linspace(low, high, steps)
+
+    @property
+    def ke(self):
+        return self._axis(self.ke_min, self.ke_max, self.ke_step)
+
+    @property
+    def g1(self):
+        return self._axis(self.g1_min, self.g1_max, self.g1_step)
+
+    @property
+    def g2(self):
+        return self._axis(self.g2_min, self.g2_max, self.g2_step)
+
+
+@dataclass(frozen=True)
+class ValuationSurface:
+    spec: DDMSpec
+    ke: np.ndarray              # (ke,)
+    g1: np.ndarray              # (g1,)
+    g2: np.ndarray              # (g2,)
+    values: np.ndarray          # (ke, g1, g2), € per azione
+    implied_g2: np.ndarray      # (ke, g1), crescita terminale implicita nel prezzo
+
+    def _index(self, axis, value):
+        return int(np.abs(axis - value).argmin())
+
+    def at(self, ke, g1, g2):
+        """Valore (€) nel punto della superficie più vicino a ``ke``, ``g1``, ``g2``."""
+        return float(self.values[self._index(self.ke, ke), self._index(self.g1, g1), self._index(self.g2, g2)])
+
+    def implied_growth(self, ke, g1):
+        """Crescita terminale implicita nel prezzo corrente (``nan`` se non raggiungibile)."""
+        return float(self.implied_g2[self._index(self.ke, ke), self._index(self.g1, g1)])
+
+    def frame(self, g1):
+        """Superficie per una crescita esplicita: righe = ke (%), colonne = crescita terminale (%)."""
+        return pd.DataFrame(
+            self.values[:, self._index(self.g1, g1), :],
+            index=pd.Index(np.round(self.ke * 100, 2), name="Costo del capitale (%)"),
+            columns=pd.Index(np.round(self.g2 * 100, 2), name="Crescita terminale (%)"),
+        )
+
+    def implied_frame(self, g1_values):
+        """Crescita terminale implicita (%) per ke, una colonna per ciascuna crescita esplicita."""
+        return pd.DataFrame(
+            {f"g1 {g1:.1%}": self.implied_g2[:, self._index(self.g1, g1)] * 100 for g1 in g1_values},
+            index=pd.Index(np.round(self.ke * 100, 2), name="Costo del capitale (%)"),
+        )
+
+
+def default_spec(df_dps_projection, company, explicit_years=5):
+    """Specifica con i DPS non storici di ``dps_projection`` e griglie attorno alle ipotesi del report."""
+    base_year = int(company["anno_ultimo_dps"])
+    forward = df_dps_projection[
+        (df_dps_projection["Tipo"] != "Storico") & (df_dps_projection["Anno"] > base_year)
+    ]
+    dividends = tuple(float(d) for d in forward["DPS (€)"]) or (float(company["ultimo_dps"]),)
+    return DDMSpec(
+        base_year=base_year,
+        dividends=dividends,
+        explicit_years=explicit_years,
+        price=float(company["prezzo_riferimento"]),
+        ke_min=0.05, ke_max=0.10, ke_step=0.001,
+        g1_min=0.0, g1_max=0.08, g1_step=0.0025,
+        g2_min=0.0, g2_max=0.04, g2_step=0.001,
+    )
+
+
+def compute_surface(spec):
+    """Valori DDM e crescita implicita su tutta la griglia (senza cache)."""
+    ke, g1, g2 = spec.ke, spec.g1, spec.g2
+    dividends = np.asarray(spec.dividends, dtype=float)
+    plan_years = len(dividends)
+    n = spec.explicit_years
+
+    # Fase 1: DPS di piano, (ke,)
+    t = np.arange(1, plan_years + 1)
+    discount = (1.0 + ke[:, None]) ** -t[None, :]
+    plan_value = discount @ dividends
+
+    # Fase 2: serie geometrica di rapporto q = (1+g1)/(1+ke), (ke, g1)
+    q = (1.0 + g1[None, :]) / (1.0 + ke[:, None])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = np.where(np.isclose(q, 1.0), n, q * (1.0 - q ** n) / (1.0 - q))
+    last_dividend = dividends[-1]
+    explicit_value = last_dividend * series / (1.0 + ke[:, None]) ** plan_years
+
+    # Fase 3: Gordon sul DPS a fine fase esplicita, attualizzato al base_year, (ke, g1, g2)
+    horizon = plan_years + n
+    terminal_dps = last_dividend * (1.0 + g1) ** n                 # (g1,)
+    scale = terminal_dps[None, :] / (1.0 + ke[:, None]) ** horizon  # (ke, g1)
+    spread = ke[:, None, None] - g2[None, None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gordon = np.where(spread > 0, (1.0 + g2[None, None, :]) / spread, np.nan)
+    explicit_total = plan_value[:, None] + explicit_value           # (ke, g1)
+    values = explicit_total[:, :, None] + scale[:, :, None] * gordon
+
+    # Crescita implicita: price = A + B (1+g)/(ke-g)  ->  g = (R ke - 1) / (R + 1), R = (price-A)/B
+    ratio = (spec.price - explicit_total) / scale
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = np.where(ratio > 0, (ratio * ke[:, None] - 1.0) / (ratio + 1.0), np.nan)
+    return ValuationSurface(spec, ke, g1, g2, values, implied)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _surface_cached(spec):
+    surface = compute_surface(spec)
+    surface.values.flags.writeable = False
+    surface.implied_g2.flags.writeable = False
+    return surface
+
+
+def valuation_surface(spec):
+    """Come ``compute_surface``, dalla cache se la specifica è già stata calcolata."""
+    with span("compute", "ddm"):
+        return _surface_cached(spec)
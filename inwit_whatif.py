@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Scenario what-if: prezzo, DPS e politica dei dividendi modificabili.
+
+I valori del registro (prezzo di riferimento, ultimo DPS pagato, crescita
+annua programmata, payout sul FCF) sono il caso base. Dalla sidebar si
+possono variare: ``apply_scenario`` restituisce una scheda del titolo con
+i valori dello scenario, così header, griglia di sensitività e simulazione
+Monte Carlo li usano senza modifiche, e ``adjust_frames`` ricalcola le
+tabelle che ne dipendono:
+
+- ``dps_projection``: le righe non storiche scalano con il DPS, quelle di
+  piano seguono la nuova crescita; il DPS di piano non supera il payout
+  sul FCF previsto dal piano industriale (per azione, sulle ultime azioni
+  in circolazione) e, dove il tetto interviene, gli anni successivi
+  crescono dal valore limitato;
+- ``yield_comp``: il dividend yield del titolo sul DPS dell'anno dopo
+  l'ultimo pagato, al prezzo dello scenario.
+
+Le tabelle base vengono dalla cache di ``inwit_data`` e non sono
+modificate; il ricalcolo è vettoriale su poche righe (frazioni di
+millisecondo). Nel caso base le tabelle sono restituite invariate.
+``numpy`` e ``inwit_data`` sono importati solo da queste funzioni: i
+controlli della sidebar e l'header non aspettano pandas e pyarrow.
+"""
+from dataclasses import dataclass
+
+import streamlit as st
+
+_FIELDS = {
+    # campo dello scenario -> chiave della scheda del titolo
+    "prezzo": "prezzo_riferimento",
+    "dps": "ultimo_dps",
+    "crescita": "crescita_dps",
+    "payout_fcf": "payout_fcf",
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    prezzo: float      # € per azione
+    dps: float         # ultimo DPS pagato, €
+    crescita: float    # crescita annua programmata del DPS
+    payout_fcf: float  # quota del FCF distribuibile
+
+    @classmethod
+    def from_company(cls, company):
+        return cls(**{field: float(company[key]) for field, key in _FIELDS.items()})
+
+
+def apply_scenario(company, scenario):
+    """Scheda del titolo con i valori di ``scenario``; il caso base resta in ``scenario_base``."""
+    base = company.get("scenario_base") or Scenario.from_company(company)
+    updated = {key: getattr(scenario, field) for field, key in _FIELDS.items()}
+    return dict(company, **updated, scenario_base=base)
+
+
+def is_base(company):
+    base = company.get("scenario_base")
+    return base is None or Scenario.from_company(company) == base
+
+
+def _plan_fcf_per_share(ticker, years):
+    """FCF per azione previsto (``nan`` se assente) per ``years``, sulle ultime azioni note."""
+    import numpy as np
+
+    from inwit_data import load_facts
+
+    facts, _ = load_facts(ticker)
+    fcf = facts[(facts["metric"] == "fcf") & (facts["status"] != "actual")]
+    shares = facts[facts["metric"] == "azioni"].sort_values("year")["value"].iloc[-1]
+    by_year = dict(zip(fcf["year"].astype(int), fcf["value"]))
+    return np.array([by_year.get(int(year), np.nan) for year in years]) / shares
+
+
+def project_dps(df, company):
+    """``dps_projection`` secondo lo scenario della scheda ``company``."""
+    import numpy as np
+
+    base = company["scenario_base"]
+    scenario = Scenario.from_company(company)
+    tipo = df["Tipo"].to_numpy()
+    forward = tipo != "Storico"
+    plan = tipo == "Piano"
+    steps = np.cumsum(plan)  # anni di crescita dall'ultimo dividendo confermato
+
+    dps = df["DPS (€)"].to_numpy(dtype=float).copy()
+    dps[forward] *= scenario.dps / base.dps
+    dps[plan] *= ((1 + scenario.crescita) / (1 + base.crescita)) ** steps[plan]
+
+    # Tetto del payout sul FCF di piano, dove il piano lo prevede; dopo un anno
+    # limitato dal tetto il DPS riparte da lì con la crescita dello scenario
+    growth = (1 + scenario.crescita) ** steps
+    cap = scenario.payout_fcf * _plan_fcf_per_share(company["ticker"], df["Anno"])
+    bound = np.fmin.accumulate(np.where(plan, cap / growth, np.nan)) * growth
+    dps[plan] = np.fmin(dps[plan], bound[plan])
+
+    result = df.copy()
+    result["DPS (€)"] = dps.round(3)
+    return result
+
+
+def yield_comparison(df, company):
+    """``yield_comp`` con il dividend yield del titolo al prezzo e DPS dello scenario."""
+    from inwit_data import load_frame
+
+    projection = project_dps(load_frame(company["ticker"], "dps_projection"), company)
+    next_year = projection[projection["Anno"] == int(company["anno_ultimo_dps"]) + 1]
+    dps = next_year["DPS (€)"].iloc[0] if len(next_year) else company["ultimo_dps"]
+    result = df.copy()
+    own = result["Società"].to_numpy() == company["nome_breve"]
+    result.loc[own, "Dividend Yield 2024E (%)"] = round(dps / company["prezzo_riferimento"] * 100, 1)
+    return result
+
+
+# Tabelle ricalcolate in base allo scenario
+ADJUSTERS = {
+    "dps_projection": project_dps,
+    "yield_comp": yield_comparison,
+}
+
+
+def adjust_frames(frames, company):
+    """Applica lo scenario alle tabelle di ``frames`` che ne dipendono."""
+    if is_base(company):
+        return frames
+    return {name: ADJUSTERS[name](df, company) if name in ADJUSTERS else df
+            for name, df in frames.items()}
+
+
+def _reset(keys):
+    for key in keys:
+        st.session_state.pop(key, None)
+
+
+def render_sidebar_inputs(company):
+    """Controlli dello scenario nella sidebar; restituisce la scheda del titolo aggiornata."""
+    base = Scenario.from_company(company)
+    keys = {field: f"whatif_{field}_{company['ticker']}" for field in _FIELDS}
+
+    with st.sidebar.expander("🧪 Scenario what-if", expanded=False):
+        prezzo = st.number_input("Prezzo dell'azione (€)", 0.5, 100.0, base.prezzo, 0.1,
+                                 format="%.2f", key=keys["prezzo"])
+        dps = st.number_input(f"Ultimo DPS pagato (€, esercizio {company['anno_ultimo_dps']})",
+                              0.01, 10.0, base.dps, 0.01, format="%.3f", key=keys["dps"])
+        crescita = st.slider("Crescita annua DPS (%)", -10.0, 25.0, base.crescita * 100, 0.5,
+                             key=keys["crescita"])
+        payout = st.slider("Payout massimo sul FCF (%)", 30, 100, int(round(base.payout_fcf * 100)), 5,
+                           key=keys["payout_fcf"])
+        scenario = Scenario(prezzo, dps, crescita / 100, payout / 100)
+        if scenario != base:
+            st.button("↩️ Ripristina valori base", on_click=_reset, args=(list(keys.values()),))
+
+    return apply_scenario(company, scenario)